@@ -5,18 +5,12 @@ This module now imports all configuration from config.py.
 """
 
 import re
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
 from difflib import SequenceMatcher
 
 # Import shared configuration
-from scripts.config import (
-    match_keywords,
-    detect_companies,
-    detect_topics,
-    COMPANY_KEYWORDS,
-    TOPIC_KEYWORDS
-)
+from scripts.config import classify_batch
 
 
 def filter_relevant_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -31,15 +25,9 @@ def filter_relevant_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, A
     """
     filtered = []
     
-    for article in articles:
-        title = article.get('title', '')
-        description = article.get('description', '')
-        combined = f"{title} {description}"
-        
-        # Detect companies and topics
-        companies = detect_companies(combined)
-        topics = detect_topics(combined)
-        
+    # Classify all articles in one batch (one scan for companies and topics)
+    pairs = [(article.get('title', ''), article.get('description', '')) for article in articles]
+    for article, (companies, topics, _generic) in zip(articles, classify_batch(pairs)):
         # Keep if any matches found
         if companies or topics:
             article['companies'] = companies
@@ -89,7 +77,16 @@ def calculate_relevance_score(article: Dict[str, Any]) -> int:
     return min(100, score)
 
 
-def update_source_health(source_name: str, success: bool, health_data: Dict) -> Dict:
+def update_source_health(
+    source_name: str,
+    success: bool,
+    health_data: Dict,
+    *,
+    latency_ms: Optional[float] = None,
+    bytes_read: Optional[int] = None,
+    entries: Optional[int] = None,
+    error: Optional[str] = None,
+) -> Dict:
     """
     Update source health tracking data.
     
@@ -97,22 +94,42 @@ def update_source_health(source_name: str, success: bool, health_data: Dict) ->
         source_name: Name of the RSS source
         success: Whether fetch was successful
         health_data: Current health data dict
+        latency_ms: Wall time of the fetch, if measured
+        bytes_read: Response bytes read, if measured
+        entries: Feed entries read on this fetch, if measured
+        error: Error message for a failed fetch
         
     Returns:
         Updated health data
     """
-    if source_name not in health_data:
-        health_data[source_name] = {
-            'last_ok': None,
-            'consecutive_failures': 0,
-            'total_entries': 0
-        }
+    health = health_data.setdefault(source_name, {})
+    health.setdefault('last_ok', None)
+    health.setdefault('consecutive_failures', 0)
+    health.setdefault('total_entries', 0)
+    health['attempts'] = int(health.get('attempts', 0) or 0) + 1
+    health['last_fetch'] = datetime.now(timezone.utc).isoformat()
     
     if success:
-        health_data[source_name]['last_ok'] = datetime.now().isoformat()
-        health_data[source_name]['consecutive_failures'] = 0
+        health['last_ok'] = health['last_fetch']
+        health['consecutive_failures'] = 0
+        health['successes'] = int(health.get('successes', 0) or 0) + 1
+        health.pop('last_error', None)
     else:
-        health_data[source_name]['consecutive_failures'] += 1
+        health['consecutive_failures'] += 1
+        if error:
+            health['last_error'] = error[:200]
+    
+    if latency_ms is not None:
+        health['latency_ms'] = round(latency_ms, 1)
+        # Exponentially weighted so one blip doesn't dominate the average.
+        previous = health.get('avg_latency_ms')
+        avg = latency_ms if previous is None else 0.7 * float(previous) + 0.3 * latency_ms
+        health['avg_latency_ms'] = round(avg, 1)
+    if bytes_read is not None:
+        health['bytes'] = int(bytes_read)
+    if entries is not None:
+        health['entries'] = int(entries)
+        health['total_entries'] += int(entries)
     
     return health_data
 
@@ -136,8 +153,12 @@ def titles_are_similar(title1: str, title2: str, threshold: float = 0.8) -> bool
     if short in long and len(short) > 15:
         return True
     
-    ratio = SequenceMatcher(None, t1, t2).ratio()
-    return ratio > threshold
+    # real_quick_ratio() >= quick_ratio() >= ratio(): rule out clearly different
+    # titles from lengths and character counts before the quadratic ratio().
+    matcher = SequenceMatcher(None, t1, t2)
+    if matcher.real_quick_ratio() <= threshold or matcher.quick_ratio() <= threshold:
+        return False
+    return matcher.ratio() > threshold
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Dedup Benchmark - TitleIndex vs scanning every known title.
+
+Builds a title history (real queue titles plus synthetic mock-server headlines)
+and checks a batch of candidates, a share of them perturbed copies of known
+titles, with both `any(title_similarity(q, t) >= 0.65 ...)` and
+scripts/dedup.py's TitleIndex. Every verdict must be identical.
+
+Usage:
+  python scripts/bench_dedup.py
+  python scripts/bench_dedup.py --history 50000 --queries 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.dedup import TITLE_DUP_THRESHOLD, TitleIndex
+from scripts.generate_news import QUEUE_FILE, title_similarity
+from scripts.mock_news_server import synthetic_items
+
+
+def perturb(rng: random.Random, title: str) -> str:
+    words = title.split()
+    op = rng.randrange(3)
+    if op == 0 and len(words) > 2:
+        words.pop(rng.randrange(len(words)))
+    elif op == 1:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(["report", "new", "update", "exclusive"]))
+    else:
+        words = [w.upper() if rng.random() < 0.3 else w for w in words]
+    return " ".join(words)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark indexed near-duplicate title detection.")
+    parser.add_argument("--history", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    history: List[str] = []
+    if QUEUE_FILE.exists():
+        queue = json.loads(QUEUE_FILE.read_text())
+        history += [i["title"] for i in (queue.get("pending") or []) + (queue.get("posted") or []) if i.get("title")]
+    history += [it["title"] for it in synthetic_items("bench-dedup", max(0, args.history - len(history)), now=now, max_age_days=30)]
+
+    # Half perturbed copies of known titles, half random titles drawn from the
+    # history's own vocabulary (plenty of shared tokens, rarely enough).
+    rng = random.Random(7)
+    vocabulary = sorted({w for t in history for w in t.split()})
+    queries = [
+        perturb(rng, rng.choice(history)) if i % 2 else " ".join(rng.choice(vocabulary) for _ in range(rng.randint(4, 12)))
+        for i in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    index = TitleIndex.load(history, path=Path("/nonexistent"))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [index.is_duplicate(q) for q in queries]
+    index_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [any(title_similarity(q, t) >= TITLE_DUP_THRESHOLD for t in history) for q in queries]
+    scan_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(indexed, scanned) if a != b)
+    print(f"history:    {len(history)} titles (index built in {build_s * 1000:.1f} ms)")
+    print(f"queries:    {len(queries)} ({sum(scanned)} duplicates)")
+    print(f"scan        {scan_s / len(queries) * 1000:9.3f} ms/query")
+    print(f"index       {index_s / len(queries) * 1000:9.3f} ms/query  ({scan_s / index_s:.0f}x)")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher Benchmark - compiled single-pass matcher vs per-keyword regex.
+
+Classifies a few thousand titles (real queue history plus synthetic mock-server
+headlines) with the original one-re.search-per-keyword loop, the compiled
+KeywordMatcher used by scripts/config.py (one text at a time), and
+classify_batch (deduplicated texts), checks that every result is identical,
+and reports the timings.
+
+Usage:
+  python scripts/bench_keywords.py
+  python scripts/bench_keywords.py --synthetic 5000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.config import AI_GENERIC_HINTS, COMPANY_KEYWORDS, TOPIC_KEYWORDS, classify_batch, classify_keywords
+from scripts.mock_news_server import synthetic_items
+
+BASE_DIR = Path(__file__).parent.parent
+QUEUE_FILE = BASE_DIR / "data" / "news_queue.json"
+
+
+def legacy_match_keywords(text: str, keyword_list: List[str]) -> bool:
+    """The original per-keyword implementation, kept here as the reference."""
+    if not text or not keyword_list:
+        return False
+    text_lower = text.lower()
+    for keyword in keyword_list:
+        if keyword.startswith(r'\b') or '\\b' in keyword:
+            pattern = keyword
+        else:
+            pattern = r'\b' + re.escape(keyword) + r'\b'
+        if re.search(pattern, text_lower, re.IGNORECASE):
+            return True
+    return False
+
+
+def legacy_classify(text: str) -> Tuple[List[str], List[str]]:
+    companies = [c for c, kws in COMPANY_KEYWORDS.items() if legacy_match_keywords(text, kws)]
+    topics = [t for t, kws in TOPIC_KEYWORDS.items() if legacy_match_keywords(text, kws)]
+    return companies, topics
+
+
+def legacy_classify_hint(text: str) -> Tuple[List[str], List[str], bool]:
+    companies, topics = legacy_classify(text)
+    return companies, topics, any(hint in text.lower() for hint in AI_GENERIC_HINTS)
+
+
+def load_corpus(synthetic: int) -> List[str]:
+    texts: List[str] = []
+    if QUEUE_FILE.exists():
+        queue = json.loads(QUEUE_FILE.read_text())
+        for item in (queue.get("pending") or []) + (queue.get("posted") or []):
+            if item.get("title"):
+                texts.append(item["title"])
+    now = datetime.now(timezone.utc)
+    for it in synthetic_items("bench-keywords", synthetic, now=now, max_age_days=7):
+        texts.append(f"{it['title']} {it['summary']}")
+    return texts
+
+
+def time_it(fn: Callable[[str], Tuple[List[str], List[str]]], texts: List[str], repeat: int) -> Tuple[float, List[Tuple[List[str], List[str]]]]:
+    best = float("inf")
+    results: List[Tuple[List[str], List[str]]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(t) for t in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword matcher against per-keyword regex.")
+    parser.add_argument("--synthetic", type=int, default=3000, help="Synthetic headlines added to the queue titles")
+    parser.add_argument("--repeat", type=int, default=3, help="Take the best of N timings")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.synthetic)
+    legacy_s, legacy = time_it(legacy_classify, texts, args.repeat)
+    compiled_s, compiled = time_it(classify_keywords, texts, args.repeat)
+
+    batch_s = float("inf")
+    batched: List[Tuple[List[str], List[str], bool]] = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        batched = classify_batch([(t, "") for t in texts])
+        batch_s = min(batch_s, time.perf_counter() - start)
+
+    mismatches: Dict[str, Tuple[object, object]] = {}
+    for text, old, new, batch in zip(texts, legacy, compiled, batched):
+        if old != new:
+            mismatches[text] = (old, new)
+        elif legacy_classify_hint(text) != batch:
+            mismatches[text] = (legacy_classify_hint(text), batch)
+
+    print(f"texts:      {len(texts)}")
+    print(f"per-keyword {legacy_s * 1000:9.1f} ms  ({legacy_s / len(texts) * 1e6:6.1f} us/text)")
+    print(f"compiled    {compiled_s * 1000:9.1f} ms  ({compiled_s / len(texts) * 1e6:6.1f} us/text)")
+    print(f"batch       {batch_s * 1000:9.1f} ms  ({batch_s / len(texts) * 1e6:6.1f} us/text)")
+    print(f"speedup     {legacy_s / compiled_s:9.1f}x compiled, {legacy_s / batch_s:.1f}x batch")
+    print(f"mismatches: {len(mismatches)}")
+    for text, (old, new) in list(mismatches.items())[:10]:
+        print(f"  {text[:70]!r}: {old} != {new}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark - run generate_news.py end to end against the mock server.
+
+Copies scripts/ into a scratch tree (so every path the pipeline writes resolves
+there, never into the real repo), points it at scripts/mock_news_server.py for
+both RSS feeds and DDG results, and runs the full fetch -> classify -> score ->
+dedup -> publish pipeline several times. Per-stage timings come from the
+`timings_ms` block each run appends to the scratch _data/run_log.json.
+
+The first run is cold; later runs reuse the scratch feed state, so they show the
+conditional-GET / incremental paths.
+
+Usage:
+  python scripts/bench_pipeline.py
+  python scripts/bench_pipeline.py --feeds 120 --items-per-feed 200 --latency-ms 200 --runs 3
+  python scripts/bench_pipeline.py --ddg-results 0 --with-queue   # blocked DDG, real queue history
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.mock_news_server import MockNewsServer, add_config_arguments, config_from_args
+
+BASE_DIR = Path(__file__).parent.parent
+QUEUE_FILE = BASE_DIR / "data" / "news_queue.json"
+
+# Non-state inputs the pipeline reads besides the queue; copied as-is.
+CONFIG_FILES: List[str] = ["data/scoring_rules.json"]
+
+
+def build_scratch_tree(root: Path, *, sources: List[Dict[str, str]], with_queue: bool) -> None:
+    shutil.copytree(BASE_DIR / "scripts", root / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    (root / "_data").mkdir(parents=True, exist_ok=True)
+    (root / "data").mkdir(parents=True, exist_ok=True)
+    (root / "_posts").mkdir(parents=True, exist_ok=True)
+    (root / "_data" / "rss_sources.json").write_text(json.dumps(sources, indent=2))
+
+    for rel in CONFIG_FILES:
+        if (BASE_DIR / rel).exists():
+            shutil.copy2(BASE_DIR / rel, root / rel)
+
+    queue: Dict[str, Any] = {"queue": [], "config": {}, "pending": [], "posted": [], "daily_usage": []}
+    if with_queue and QUEUE_FILE.exists():
+        queue = json.loads(QUEUE_FILE.read_text())
+    # Never stop early on the daily limit; every run should exercise every stage.
+    queue["config"] = {**(queue.get("config") or {}), "daily_post_limit": 10**6}
+    (root / "data" / "news_queue.json").write_text(json.dumps(queue, indent=2))
+
+
+def run_once(root: Path, *, ddg_endpoint: str, extra_args: Sequence[str] = ()) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env["NEWS_DDG_ENDPOINT"] = ddg_endpoint
+    env.pop("GITHUB_EVENT_NAME", None)
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(root / "scripts" / "generate_news.py"), *extra_args],
+        cwd=str(root),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"generate_news.py failed ({proc.returncode}):\n{proc.stderr}")
+
+    log = json.loads((root / "_data" / "run_log.json").read_text())
+    entry = log[-1] if log else {}
+    return {
+        "wall_ms": wall_ms,
+        "timings_ms": entry.get("timings_ms", {}) or {},
+        "candidates": entry.get("candidates_found", 0),
+        "feeds": entry.get("feeds", {}),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    stages: List[str] = []
+    for r in results:
+        for name in r["timings_ms"]:
+            if name not in stages:
+                stages.append(name)
+
+    header = f"{'stage':<14}" + "".join(f"{'run ' + str(i + 1):>12}" for i in range(len(results)))
+    print(header)
+    print("-" * len(header))
+    for name in stages:
+        row = "".join(f"{r['timings_ms'].get(name, 0.0):>12.1f}" for r in results)
+        print(f"{name:<14}{row}")
+    print("-" * len(header))
+    print(f"{'wall (proc)':<14}" + "".join(f"{r['wall_ms']:>12.1f}" for r in results))
+    print(f"{'candidates':<14}" + "".join(f"{r['candidates']:>12d}" for r in results))
+    print("\nAll times in ms.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generate_news.py against the local mock news server.")
+    add_config_arguments(parser)
+    parser.add_argument("--runs", type=int, default=2, help="Consecutive runs (first is cold)")
+    parser.add_argument("--with-queue", action="store_true", help="Start from a copy of data/news_queue.json")
+    parser.add_argument("--all-feeds", action="store_true", help="Pass --all-feeds so warm runs ignore the poll schedule")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tree and print its path")
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="news-bench-"))
+    try:
+        with MockNewsServer(config_from_args(args)) as server:
+            build_scratch_tree(scratch, sources=server.feed_sources(), with_queue=args.with_queue)
+            extra_args = ["--all-feeds"] if args.all_feeds else []
+            results = [
+                run_once(scratch, ddg_endpoint=f"{server.base_url}/ddg/news", extra_args=extra_args)
+                for _ in range(max(1, args.runs))
+            ]
+            requests = server.requests
+    finally:
+        if args.keep:
+            print(f"Scratch tree: {scratch}")
+        else:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+        print(f"Mock server handled {requests} requests.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
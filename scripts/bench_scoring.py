@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Scoring Benchmark - table-driven batch scoring vs the original score_story.
+
+Scores a synthetic backfill (mock-server headlines classified with the real
+keyword config, spread over two weeks of publication dates) with the original
+branch-chain score_story, kept here as the reference, and with
+scripts/scoring.py's compiled rules. Every score must be identical.
+
+Usage:
+  python scripts/bench_scoring.py
+  python scripts/bench_scoring.py --stories 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import scoring
+from scripts.config import classify_batch, get_company_tier
+from scripts.mock_news_server import synthetic_items
+
+
+def legacy_score_story(*, title: str, snippet: str, companies: Sequence[str], topics: Sequence[str], published_at: Optional[datetime]) -> int:
+    score = 0
+
+    if published_at:
+        age_days = (datetime.now(timezone.utc) - published_at).days
+        if age_days <= 0:
+            score += 25
+        elif age_days <= 1:
+            score += 22
+        elif age_days <= 3:
+            score += 16
+        elif age_days <= 7:
+            score += 10
+        else:
+            score -= 15
+
+    title_lower = (title or "").lower()
+    combined_lower = f"{title} {snippet}".lower()
+
+    for c in companies:
+        tier = get_company_tier(c)
+        score += 18 if tier == 1 else 10
+        if c in title_lower:
+            score += 6
+
+    for t in topics:
+        score += 3 if t == "ai" else 8
+        if t in title_lower:
+            score += 3
+
+    if any(
+        k in combined_lower
+        for k in (
+            "release", "launch", "announc", "introduc", "open-sourc", "weights", "funding",
+            "raises", "acquires", "partnership", "policy", "regulation", "ban",
+        )
+    ):
+        score += 6
+    if any(k in combined_lower for k in ("rumor", "leak", "reportedly", "unconfirmed")):
+        score -= 4
+
+    return max(0, min(100, score))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark table-driven batch scoring against score_story.")
+    parser.add_argument("--stories", type=int, default=20000)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    items = synthetic_items("bench-scoring", args.stories, now=now, max_age_days=14)
+    labels = classify_batch([(it["title"], it["summary"]) for it in items])
+    stories = [(it["title"], it["summary"], c, t or ["ai"]) for it, (c, t, _) in zip(items, labels)]
+    published: List[Optional[datetime]] = [None if i % 50 == 0 else it["published"] for i, it in enumerate(items)]
+
+    start = time.perf_counter()
+    legacy = [
+        legacy_score_story(title=title, snippet=snippet, companies=c, topics=t, published_at=p)
+        for (title, snippet, c, t), p in zip(stories, published)
+    ]
+    legacy_s = time.perf_counter() - start
+
+    rules = scoring.load_scoring_rules()
+    start = time.perf_counter()
+    scores = rules.score_batch(stories, published, now)
+    batch_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, scores) if a != b)
+    print(f"stories:    {len(stories)}")
+    print(f"score_story {legacy_s * 1000:9.1f} ms")
+    print(f"batch       {batch_s * 1000:9.1f} ms  ({legacy_s / batch_s:.1f}x, {mismatches} mismatches)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
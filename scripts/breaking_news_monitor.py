@@ -8,12 +8,12 @@ from pathlib import Path
 # Add repo root to path for imports when running script directly
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 # Import shared configuration
 from scripts.config import match_keywords
+from scripts.storage import append_run_log
 
 # Keywords that indicate breaking news
 BREAKING_KEYWORDS = [
@@ -56,23 +56,8 @@ def log_breaking_news(post: Dict[str, Any]) -> None:
         "filename": post.get("filename", "")
     }
     
-    # Append to run log
-    log_data = []
-    if RUN_LOG_FILE.exists():
-        with open(RUN_LOG_FILE, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except json.JSONDecodeError:
-                log_data = []
-    
-    log_data.append(log_entry)
-    
-    # Keep only last 200 entries
-    if len(log_data) > 200:
-        log_data = log_data[-200:]
-    
-    with open(RUN_LOG_FILE, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    # Append to run log (locked, atomic, shared retention)
+    append_run_log(log_entry, RUN_LOG_FILE)
     
     print(f"  🚨 BREAKING: {post.get('title', '')[:80]}...")
 
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Persistent classification/score cache for the news pipeline.
+
+The same RSS entries are seen run after run until they age out of their feeds,
+so generate_news.py remembers, per distinct (title, snippet), the companies and
+topics it matched and the age-independent part of its score. Stored compactly
+as data/classify_cache.json:
+
+  {
+    "version": "3f2a9c1b04de:1",   # keyword config hash : scoring rules version
+    "entries": {
+      "<sha1(title, snippet)[:20]>": {
+        "c": ["openai"],            # companies
+        "t": ["llm"],               # topics
+        "b": 37,                    # base score (None if not AI relevant)
+        "seen": "2026-03-22"        # last day the entry was used
+      }
+    }
+  }
+
+A version mismatch discards the whole cache; entries not used for
+CLASSIFY_CACHE_MAX_AGE_DAYS are evicted on save.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+CLASSIFY_CACHE_FILE = REPO_ROOT / "data" / "classify_cache.json"
+
+# Feeds keep items for about a week; keep a margin beyond that.
+CLASSIFY_CACHE_MAX_AGE_DAYS = 14
+CLASSIFY_CACHE_MAX_ENTRIES = 20000
+
+
+def content_key(title: str, snippet: str) -> str:
+    digest = hashlib.sha1(f"{title or ''}\0{snippet or ''}".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+
+class ClassifyCache:
+    """Cached (companies, topics, base_score) per distinct article text."""
+
+    def __init__(self, version: str, entries: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.version = version
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self.today = date.today().isoformat()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, version: str, path: Optional[Path] = None) -> "ClassifyCache":
+        path = path or CLASSIFY_CACHE_FILE
+        if not path.exists():
+            return cls(version)
+        try:
+            data = json.loads(path.read_text())
+        except Exception:
+            return cls(version)
+        if not isinstance(data, dict) or data.get("version") != version:
+            return cls(version)
+        entries = data.get("entries")
+        return cls(version, entries if isinstance(entries, dict) else {})
+
+    def get(self, key: str) -> Optional[Tuple[List[str], List[str], Optional[int]]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["seen"] = self.today
+        return list(entry.get("c") or []), list(entry.get("t") or []), entry.get("b")
+
+    def put(self, key: str, companies: List[str], topics: List[str], base_score: Optional[int]) -> None:
+        self.entries[key] = {"c": list(companies), "t": list(topics), "b": base_score, "seen": self.today}
+
+    def evict(self, max_age_days: int = CLASSIFY_CACHE_MAX_AGE_DAYS, max_entries: int = CLASSIFY_CACHE_MAX_ENTRIES) -> int:
+        """Drop entries unused for max_age_days, then the oldest beyond max_entries."""
+        cutoff = (date.fromisoformat(self.today) - timedelta(days=max_age_days)).isoformat()
+        keep = {k: v for k, v in self.entries.items() if str(v.get("seen", "")) >= cutoff}
+        if len(keep) > max_entries:
+            newest = sorted(keep, key=lambda k: str(keep[k].get("seen", "")), reverse=True)[:max_entries]
+            keep = {k: keep[k] for k in newest}
+        evicted = len(self.entries) - len(keep)
+        self.entries = keep
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = path or CLASSIFY_CACHE_FILE
+        self.evict()
+        payload = {"version": self.version, "entries": self.entries}
+        atomic_write_text(path, json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Cross-source story clustering over a rolling window.
+
+When a story breaks it arrives from several outlets (and DDG) with different
+headlines that share few exact words. Each relevant item is turned into a
+TF-IDF vector over its title and snippet terms (title terms count double) and
+joined to the cluster from the last CLUSTER_WINDOW_DAYS whose centroid is most
+similar, if the cosine similarity reaches CLUSTER_SIMILARITY and the item
+shares at least CLUSTER_MIN_SHARED_TERMS terms with it; otherwise it starts a
+new cluster. Short titles reach a high cosine on one or two common words
+("Introducing Codex" / "Introducing the Codex app"), hence the second check.
+Vectors are sparse dicts and candidate clusters come from an inverted term
+index, so only clusters sharing a term are compared.
+
+Each cluster has at most one representative: the item that made it into the
+queue. For a cluster that has none yet, generate_news.py scores every member
+and queues the best one that passes its score and duplicate checks; once a
+cluster has a representative, later members are skipped. State lives in
+data/story_clusters.json, a local cache that is not committed: a fresh
+checkout rebuilds the window from recent queue entries (sync_queue), each of
+which becomes its cluster's representative.
+
+  {
+    "next_id": 42,
+    "items": {"<url>": {"terms": {"openai": 2, ...}, "cluster": 7, "at": "2026-03-22T10:00:00+00:00"}},
+    "clusters": {"7": {"rep": "<url>"}}
+  }
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from scripts.feed_state import parse_ts
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+STORY_CLUSTERS_FILE = REPO_ROOT / "data" / "story_clusters.json"
+
+CLUSTER_WINDOW_DAYS = 3
+CLUSTER_SIMILARITY = 0.55
+CLUSTER_MIN_SHARED_TERMS = 3
+# Items with fewer distinct terms (e.g. "GPT-4") always start their own cluster.
+CLUSTER_MIN_TERMS = 3
+TITLE_TERM_WEIGHT = 2
+SNIPPET_TERM_WEIGHT = 1
+
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9\-]*[a-z0-9]|[a-z0-9]")
+STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have how in is it its new of on or says
+    that the this to was what when why will with you your after over into about
+    """.split()
+)
+
+
+def story_terms(title: str, snippet: str = "") -> Dict[str, int]:
+    """Term counts for an item; title terms weigh more than snippet terms."""
+    terms: Dict[str, int] = {}
+    for text, weight in ((title, TITLE_TERM_WEIGHT), (snippet, SNIPPET_TERM_WEIGHT)):
+        for term in _TERM_RE.findall((text or "").lower()):
+            if term not in STOPWORDS and len(term) > 1:
+                terms[term] = terms.get(term, 0) + weight
+    return terms
+
+
+class StoryClusters:
+    """Incremental centroid-based TF-IDF clustering of recent items."""
+
+    def __init__(
+        self,
+        state: Optional[Dict[str, Any]] = None,
+        *,
+        window_days: int = CLUSTER_WINDOW_DAYS,
+        similarity: float = CLUSTER_SIMILARITY,
+        now: Optional[datetime] = None,
+    ) -> None:
+        state = state or {}
+        self.window_days = window_days
+        self.similarity = similarity
+        self.now = now or datetime.now(timezone.utc)
+        self.next_id = int(state.get("next_id", 0) or 0)
+        self.items: Dict[str, Dict[str, Any]] = dict(state.get("items") or {})
+        self.clusters: Dict[str, Dict[str, Any]] = dict(state.get("clusters") or {})
+        # term -> clusters with a member containing it
+        self._postings: Dict[str, Set[str]] = {}
+        self._df: Dict[str, int] = {}
+        self._members: Dict[str, List[str]] = {}
+        self.expire()
+        for key, item in self.items.items():
+            self._index(key, item)
+        # Centroid weights per cluster id, valid for the current batch's IDF.
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._norms: Dict[str, float] = {}
+
+    def _index(self, key: str, item: Dict[str, Any]) -> None:
+        cluster_id = str(item.get("cluster"))
+        self._members.setdefault(cluster_id, []).append(key)
+        for term in item.get("terms") or {}:
+            self._postings.setdefault(term, set()).add(cluster_id)
+            self._df[term] = self._df.get(term, 0) + 1
+
+    def expire(self) -> int:
+        """Drop items older than the window, and clusters left empty."""
+        cutoff = self.now - timedelta(days=self.window_days)
+        stale = [key for key, item in self.items.items() if (parse_ts(item.get("at")) or cutoff) <= cutoff]
+        for key in stale:
+            del self.items[key]
+        live = {str(item.get("cluster")) for item in self.items.values()}
+        self.clusters = {cid: c for cid, c in self.clusters.items() if cid in live}
+        return len(stale)
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self.items)) / (1 + self._df.get(term, 0))) + 1.0
+
+    def _vector(self, terms: Dict[str, int]) -> Tuple[Dict[str, float], float]:
+        vec = {term: count * self._idf(term) for term, count in terms.items()}
+        return vec, math.sqrt(sum(w * w for w in vec.values()))
+
+    def _centroid(self, cluster_id: str) -> Tuple[Dict[str, float], float]:
+        """Sum of the members' unit TF-IDF vectors (cached for the batch)."""
+        if cluster_id not in self._weights:
+            centroid: Dict[str, float] = {}
+            for key in self._members.get(cluster_id, ()):
+                vec, norm = self._vector(self.items[key].get("terms") or {})
+                if not norm:
+                    continue
+                for term, weight in vec.items():
+                    centroid[term] = centroid.get(term, 0.0) + weight / norm
+            self._weights[cluster_id] = centroid
+            self._norms[cluster_id] = math.sqrt(sum(w * w for w in centroid.values()))
+        return self._weights[cluster_id], self._norms[cluster_id]
+
+    def _add_to_centroid(self, cluster_id: str, terms: Dict[str, int]) -> None:
+        centroid = self._weights.get(cluster_id)
+        if centroid is None:
+            return  # built from the members (including this one) when next needed
+        vec, norm = self._vector(terms)
+        if not norm:
+            return
+        for term, weight in vec.items():
+            centroid[term] = centroid.get(term, 0.0) + weight / norm
+        self._norms[cluster_id] = math.sqrt(sum(w * w for w in centroid.values()))
+
+    def most_similar(self, terms: Dict[str, int]) -> Tuple[Optional[str], float]:
+        """
+        Cluster whose centroid is most similar (sparse cosine over shared terms).
+        Comparing against centroids rather than single members keeps loosely
+        related items from chaining clusters together.
+        """
+        vec, norm = self._vector(terms)
+        if not norm:
+            return None, 0.0
+        # A centroid holds exactly its members' terms, so the postings give each
+        # cluster's shared terms without building centroids that can't qualify.
+        shared_terms: Dict[str, List[str]] = {}
+        for term in vec:
+            for cluster_id in self._postings.get(term, ()):
+                shared_terms.setdefault(cluster_id, []).append(term)
+        best_id, best_sim = None, 0.0
+        for cluster_id, shared in shared_terms.items():
+            if len(shared) < CLUSTER_MIN_SHARED_TERMS:
+                continue
+            centroid, centroid_norm = self._centroid(cluster_id)
+            if not centroid_norm:
+                continue
+            dot = sum(vec[t] * centroid[t] for t in shared)
+            sim = dot / (norm * centroid_norm)
+            if sim > best_sim:
+                best_id, best_sim = cluster_id, sim
+        return best_id, best_sim
+
+    def assign(self, key: str, title: str, snippet: str = "", at: Optional[datetime] = None) -> str:
+        """Add an item (if new) and return its cluster id."""
+        if key in self.items:
+            return str(self.items[key]["cluster"])
+        terms = story_terms(title, snippet)
+        best_id, best_sim = self.most_similar(terms) if len(terms) >= CLUSTER_MIN_TERMS else (None, 0.0)
+        if best_id is not None and best_sim >= self.similarity:
+            cluster_id = best_id
+            self._add_to_centroid(cluster_id, terms)
+        else:
+            cluster_id = str(self.next_id)
+            self.next_id += 1
+            self.clusters[cluster_id] = {"rep": None}
+        item = {"terms": terms, "cluster": cluster_id, "at": (at or self.now).isoformat()}
+        self.items[key] = item
+        self._index(key, item)
+        return cluster_id
+
+    def assign_batch(self, items: Sequence[Tuple[str, str, str]]) -> List[str]:
+        """
+        assign() for (key, title, snippet) items. Cached centroids are reset per
+        batch, so their IDF weights follow the window as it grows.
+        """
+        self._weights.clear()
+        self._norms.clear()
+        return [self.assign(key, title, snippet) for key, title, snippet in items]
+
+    def representative(self, cluster_id: str) -> Optional[str]:
+        return (self.clusters.get(cluster_id) or {}).get("rep")
+
+    def set_representative(self, cluster_id: str, key: str) -> None:
+        self.clusters.setdefault(cluster_id, {})["rep"] = key
+
+    def sync_queue(self, entries: Iterable[Dict[str, Any]], *, date_field: str) -> None:
+        """Add recent queue entries missing from the window as their clusters' representatives."""
+        cutoff = (self.now - timedelta(days=self.window_days)).date().isoformat()
+        for entry in entries:
+            url = entry.get("canonical_url") or entry.get("url") or ""
+            day = str(entry.get(date_field) or "")[:10]
+            if not url or url in self.items or day < cutoff:
+                continue
+            cluster_id = self.assign(url, entry.get("title", "") or "")
+            if self.representative(cluster_id) is None:
+                self.set_representative(cluster_id, url)
+
+    def stats(self) -> Dict[str, int]:
+        return {"items": len(self.items), "clusters": len(self.clusters)}
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"next_id": self.next_id, "items": self.items, "clusters": self.clusters}
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None, **kwargs: Any) -> "StoryClusters":
+        path = path or STORY_CLUSTERS_FILE
+        state: Dict[str, Any] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if isinstance(data, dict):
+                    state = data
+            except Exception:
+                state = {}
+        return cls(state, **kwargs)
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = path or STORY_CLUSTERS_FILE
+        self.expire()
+        atomic_write_text(path, json.dumps(self.to_state(), separators=(",", ":"), sort_keys=True, ensure_ascii=False))
@@ -4,8 +4,12 @@ Shared configuration for AI news aggregator.
 Single source of truth for keywords and utility functions.
 """
 
+import hashlib
+import json
 import re
-from typing import List, Dict, Any, Set
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Optional, Sequence, Set, Tuple
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
 
 # =============================================================================
 # COMPANY KEYWORDS (Tier 1 - Major AI Companies)
@@ -119,10 +123,160 @@ TOPIC_KEYWORDS: Dict[str, List[str]] = {
     ]
 }
 
+# =============================================================================
+# GENERIC AI HINTS (no specific company/topic, but clearly about AI)
+# =============================================================================
+AI_GENERIC_HINTS: List[str] = [
+    "artificial intelligence",
+    "generative ai",
+    "genai",
+    "large language model",
+    "llm",
+    "foundation model",
+    "chatbot",
+    "ai agent",
+]
+
+# =============================================================================
+# URL CANONICALIZATION (query parameters that only track, never identify)
+# =============================================================================
+TRACKING_QUERY_PARAMS: FrozenSet[str] = frozenset({
+    "ref", "ref_src", "ref_url", "source", "src", "cmpid", "fbclid", "gclid",
+    "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "mkt_tok", "guccounter",
+    "guce_referrer", "guce_referrer_sig", "taid", "smid", "sr_share",
+})
+TRACKING_QUERY_PREFIXES: Tuple[str, ...] = ("utm_", "at_", "pk_", "hsa_")
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+def keyword_pattern(keyword: str) -> str:
+    """
+    Regex for a single keyword: explicit regexes (containing \\b) are used as is,
+    plain keywords are escaped and wrapped in word boundaries.
+    """
+    if keyword.startswith(r'\b') or '\\b' in keyword:
+        return keyword
+    return r'\b' + re.escape(keyword) + r'\b'
+
+
+def _trie_pattern(literals: List[str]) -> str:
+    """
+    Build a prefix-sharing alternation for word-bounded literals.
+
+    At every trie node the longer continuations are tried before the node's own
+    end-of-keyword boundary, so the first successful match at a position is the
+    longest keyword there (what KeywordMatcher relies on).
+    """
+    trie: Dict[str, Any] = {}
+    for literal in literals:
+        node = trie
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if '' in node:
+            branches.append(r'\b')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    All keywords of several label groups compiled into one regex.
+
+    A single scan over the text reports every label (e.g. every company and
+    topic) that has at least one matching keyword, with the same semantics as
+    testing each keyword's pattern separately.
+
+    The scan is a zero-width lookahead tried at each word start (over a
+    prefix-sharing trie of the keywords), so matches may overlap. At any position
+    the alternation returns only the longest keyword that matches there; shorter
+    keywords matching at the same position are necessarily word-bounded prefixes
+    of it, so their labels are folded into the longer keyword's label set at
+    compile time.
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, List[str]]]) -> None:
+        self.groups = groups
+        # Label order per group, so results come back in dict order like before.
+        self._order: Dict[str, Dict[str, int]] = {
+            group: {label: i for i, label in enumerate(keywords)}
+            for group, keywords in groups.items()
+        }
+
+        literal_labels: Dict[str, Set[Tuple[str, str]]] = {}
+        literal_patterns: Dict[str, str] = {}
+        complex_patterns: List[Tuple[Any, Tuple[str, str]]] = []
+        for group, keywords in groups.items():
+            for label, keyword_list in keywords.items():
+                for keyword in keyword_list:
+                    pattern = keyword_pattern(keyword)
+                    literal = keyword.replace(r'\b', '') if pattern == keyword else keyword
+                    if not pattern.endswith(r'\b') or not re.fullmatch(pattern, literal, re.IGNORECASE):
+                        # Real regex (not just a boundary-wrapped word): checked on its own.
+                        complex_patterns.append((re.compile(pattern, re.IGNORECASE), (group, label)))
+                        continue
+                    literal = literal.lower()
+                    literal_labels.setdefault(literal, set()).add((group, label))
+                    literal_patterns.setdefault(literal, pattern)
+
+        # Fold in labels of shorter keywords implied by each longer one.
+        compiled = {lit: re.compile(pat, re.IGNORECASE) for lit, pat in literal_patterns.items()}
+        self._labels: Dict[str, FrozenSet[Tuple[str, str]]] = {}
+        for literal in literal_labels:
+            labels = set(literal_labels[literal])
+            for other, regex in compiled.items():
+                if other != literal and len(other) < len(literal) and regex.match(literal):
+                    labels |= literal_labels[other]
+            self._labels[literal] = frozenset(labels)
+
+        alternation = _trie_pattern(sorted(literal_patterns))
+        self._regex = re.compile(r'\b(?=(' + alternation + r'))', re.IGNORECASE) if literal_patterns else None
+        self._complex = complex_patterns
+
+    def labels(self, text: str) -> Set[Tuple[str, str]]:
+        """Return every (group, label) with at least one keyword match in `text`."""
+        found: Set[Tuple[str, str]] = set()
+        if not text:
+            return found
+        text_lower = text.lower()
+        if self._regex is not None:
+            for hit in set(self._regex.findall(text_lower)):
+                found |= self._labels[hit.lower()]
+        for regex, label in self._complex:
+            if label not in found and regex.search(text_lower):
+                found.add(label)
+        return found
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return {group: [labels in definition order]} for every group."""
+        return self._ordered(self.labels(text))
+
+    def _ordered(self, found: Set[Tuple[str, str]]) -> Dict[str, List[str]]:
+        out: Dict[str, List[str]] = {group: [] for group in self.groups}
+        for group, label in found:
+            out[group].append(label)
+        for group, labels in out.items():
+            labels.sort(key=self._order[group].__getitem__)
+        return out
+
+
+# Compiled once at import: companies and topics in a single scan.
+KEYWORD_MATCHER = KeywordMatcher({"companies": COMPANY_KEYWORDS, "topics": TOPIC_KEYWORDS})
+
+
+@lru_cache(maxsize=64)
+def _keyword_list_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher({"any": {"any": list(keywords)}})
+
+
 def match_keywords(text: str, keyword_list: List[str]) -> bool:
     """
     Match text against a list of keywords using word-boundary regex.
@@ -136,22 +290,60 @@ def match_keywords(text: str, keyword_list: List[str]) -> bool:
     """
     if not text or not keyword_list:
         return False
-        
-    text_lower = text.lower()
+
+    return bool(_keyword_list_matcher(tuple(keyword_list)).labels(text))
+
+
+def classify_keywords(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Detect companies and topics in one pass over the text.
     
-    for keyword in keyword_list:
-        # If keyword is already a regex pattern (starts with r'\b' etc), use as is
-        if keyword.startswith(r'\b') or '\\b' in keyword:
-            pattern = keyword
-        else:
-            # Escape regex special characters and add word boundaries
-            escaped = re.escape(keyword)
-            pattern = r'\b' + escaped + r'\b'
+    Args:
+        text: Combined text to search in
         
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            return True
+    Returns:
+        (companies, topics), each in COMPANY_KEYWORDS / TOPIC_KEYWORDS order
+    """
+    matched = KEYWORD_MATCHER.match(text)
+    return matched["companies"], matched["topics"]
+
+
+def _hint_regex() -> Optional[Any]:
+    if not AI_GENERIC_HINTS:
+        return None
+    return re.compile("|".join(re.escape(hint.lower()) for hint in AI_GENERIC_HINTS))
+
+
+_AI_HINT_REGEX = _hint_regex()
+
+
+def classify_batch(pairs: Sequence[Tuple[str, str]]) -> List[Tuple[List[str], List[str], bool]]:
+    """
+    Classify many (title, snippet) pairs in one go.
+    
+    Texts are combined as "title snippet" (as in is_ai_relevant) and each
+    distinct text is classified once with the compiled KEYWORD_MATCHER, so
+    repeated stories across sources cost a single scan.
     
-    return False
+    Args:
+        pairs: Sequence of (title, snippet) tuples
+        
+    Returns:
+        One (companies, topics, generic_ai_hint) tuple per pair, in input order.
+        generic_ai_hint is True if the text contains any AI_GENERIC_HINTS phrase
+        (plain substring match, like before).
+    """
+    classified: Dict[str, Tuple[List[str], List[str], bool]] = {}
+    results: List[Tuple[List[str], List[str], bool]] = []
+    for title, snippet in pairs:
+        text = f"{title or ''} {snippet or ''}".strip()
+        found = classified.get(text)
+        if found is None:
+            matched = KEYWORD_MATCHER.match(text)
+            hinted = _AI_HINT_REGEX is not None and bool(_AI_HINT_REGEX.search(text.lower()))
+            found = classified[text] = (matched["companies"], matched["topics"], hinted)
+        results.append((list(found[0]), list(found[1]), found[2]))
+    return results
 
 
 def detect_companies(text: str) -> List[str]:
@@ -164,13 +356,7 @@ def detect_companies(text: str) -> List[str]:
     Returns:
         List of company keys that matched
     """
-    companies_found = []
-    
-    for company, keywords in COMPANY_KEYWORDS.items():
-        if match_keywords(text, keywords):
-            companies_found.append(company)
-    
-    return companies_found
+    return classify_keywords(text)[0]
 
 
 def detect_topics(text: str) -> List[str]:
@@ -183,13 +369,7 @@ def detect_topics(text: str) -> List[str]:
     Returns:
         List of topic keys that matched
     """
-    topics_found = []
-    
-    for topic, keywords in TOPIC_KEYWORDS.items():
-        if match_keywords(text, keywords):
-            topics_found.append(topic)
-    
-    return topics_found
+    return classify_keywords(text)[1]
 
 
 def get_company_tier(company: str) -> int:
@@ -207,4 +387,68 @@ def get_company_tier(company: str) -> int:
         "amazon", "apple", "nvidia"
     ]
     
-    return 1 if company in tier1_companies else 2
\ No newline at end of file
+    return 1 if company in tier1_companies else 2
+
+
+def is_tracking_param(name: str) -> bool:
+    """
+    Check a query parameter name against the tracking denylist.
+    
+    Args:
+        name: Raw (possibly percent-encoded) parameter name
+        
+    Returns:
+        True if the parameter should be dropped from canonical URLs
+    """
+    name = unquote_plus(name).strip().lower()
+    return name in TRACKING_QUERY_PARAMS or name.startswith(TRACKING_QUERY_PREFIXES)
+
+
+@lru_cache(maxsize=16384)
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, used as its identity for dedup.
+    
+    Lowercases the scheme and host, drops the fragment and tracking query
+    parameters (TRACKING_QUERY_PARAMS / TRACKING_QUERY_PREFIXES), and sorts
+    the remaining parameters. Parameters are kept exactly as encoded.
+    Results are cached, since the same URLs recur across feeds and runs.
+    
+    Args:
+        url: Absolute URL as found in a feed or the queue
+        
+    Returns:
+        Canonical URL ("" for empty input; unparseable input is only stripped)
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    netloc = parts.netloc
+    userinfo, at, host = netloc.rpartition("@")
+    netloc = f"{userinfo}{at}{host.lower()}"
+
+    params = [p for p in parts.query.split("&") if p and not is_tracking_param(p.split("=", 1)[0])]
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path, "&".join(sorted(params)), ""))
+
+
+def keyword_config_version() -> str:
+    """
+    Short hash of everything classification depends on (keywords, generic
+    hints, company tiers). Caches keyed on it are invalidated automatically
+    whenever this file's keyword configuration changes.
+    
+    Returns:
+        12-character hex digest
+    """
+    payload = {
+        "companies": COMPANY_KEYWORDS,
+        "topics": TOPIC_KEYWORDS,
+        "hints": AI_GENERIC_HINTS,
+        "tiers": {company: get_company_tier(company) for company in COMPANY_KEYWORDS},
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:12]
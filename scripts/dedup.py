@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Indexed near-duplicate title detection.
+
+generate_news.title_similarity() scores two titles as the share of word tokens
+they have in common (|A & B| / max(|A|, |B|)), or 1.0 for identical titles.
+Comparing each candidate against every known title is O(N x M); TitleIndex
+keeps each known title's token set in an inverted index and only compares
+titles that can possibly reach the threshold:
+
+  - a title T can only match query Q if |T| is within [t*|Q|, |Q|/t] tokens;
+  - if T shares at least k tokens with Q, it must contain one of Q's
+    |Q| - k + 1 rarest tokens (prefix filtering), so only those postings are
+    read.
+
+Results are exactly those of `any(title_similarity(q, t) >= threshold ...)`.
+
+Token sets are persisted in data/title_index.json and synced against the
+current queue titles on load, so only new titles are tokenized.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+TITLE_INDEX_FILE = REPO_ROOT / "data" / "title_index.json"
+
+TITLE_DUP_THRESHOLD = 0.65
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_title(title: str) -> str:
+    return (title or "").lower().strip()
+
+
+def title_tokens(normalized: str) -> FrozenSet[str]:
+    return frozenset(_TOKEN_RE.findall(normalized))
+
+
+class TitleIndex:
+    """Inverted token index over known titles for near-duplicate lookups."""
+
+    def __init__(self, threshold: float = TITLE_DUP_THRESHOLD) -> None:
+        self.threshold = threshold
+        self._tokens: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def __contains__(self, title: str) -> bool:
+        return normalize_title(title) in self._tokens
+
+    def add(self, title: str, tokens: Optional[Iterable[str]] = None) -> None:
+        norm = normalize_title(title)
+        if not norm or norm in self._tokens:
+            return
+        token_set = frozenset(tokens) if tokens is not None else title_tokens(norm)
+        self._tokens[norm] = token_set
+        for token in token_set:
+            self._postings.setdefault(token, set()).add(norm)
+
+    def _min_overlap(self, size: int) -> int:
+        # Smallest shared-token count k with k / size >= threshold, using the
+        # same float comparison as title_similarity.
+        k = 1
+        while k < size and k / size < self.threshold:
+            k += 1
+        return k
+
+    def find_similar(self, title: str) -> Optional[str]:
+        """Return a known title similar to `title` (>= threshold), or None."""
+        norm = normalize_title(title)
+        if not norm:
+            return None
+        if norm in self._tokens:
+            return norm
+        query = title_tokens(norm)
+        if not query:
+            return None
+
+        size = len(query)
+        # Rarest tokens first: fewest postings to read.
+        ordered = sorted(query, key=lambda token: len(self._postings.get(token, ())))
+        prefix = ordered[: size - self._min_overlap(size) + 1]
+
+        checked: Set[str] = set()
+        for token in prefix:
+            for other in self._postings.get(token, ()):
+                if other in checked:
+                    continue
+                checked.add(other)
+                other_tokens = self._tokens[other]
+                if len(query & other_tokens) / max(size, len(other_tokens)) >= self.threshold:
+                    return other
+        return None
+
+    def is_duplicate(self, title: str) -> bool:
+        return self.find_similar(title) is not None
+
+    @classmethod
+    def load(cls, titles: Iterable[str], path: Optional[Path] = None, threshold: float = TITLE_DUP_THRESHOLD) -> "TitleIndex":
+        """
+        Build the index for `titles`, reusing token sets stored in `path`.
+        Stored titles that are no longer in `titles` are dropped.
+        """
+        path = path or TITLE_INDEX_FILE
+        stored: Dict[str, List[str]] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                if isinstance(data, dict) and isinstance(data.get("titles"), dict):
+                    stored = data["titles"]
+            except Exception:
+                stored = {}
+
+        index = cls(threshold)
+        for title in titles:
+            norm = normalize_title(title)
+            tokens = stored.get(norm)
+            index.add(norm, tokens.split() if isinstance(tokens, str) else None)
+        return index
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = path or TITLE_INDEX_FILE
+        payload = {"titles": {norm: " ".join(sorted(tokens)) for norm, tokens in self._tokens.items()}}
+        atomic_write_text(path, json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False))
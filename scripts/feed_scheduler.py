@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Adaptive polling schedule for RSS sources.
+
+Each feed's publication times are remembered in its _data/feed_state.json entry
+("cadence"). From those we estimate how often the source publishes and only poll
+it again once a fraction of that interval has passed since the last check:
+TechCrunch (hourly) stays due on every run, while a blog posting twice a week
+is polled every few hours. The poll interval is capped well below how long
+items stay in a feed, so combined with the seen-ID cursor no story is missed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from scripts.feed_state import parse_ts
+
+CADENCE_SAMPLES = 20
+CADENCE_MIN_SAMPLES = 3
+# Poll at this fraction of the observed publication interval.
+POLL_FRACTION = 0.5
+POLL_MIN = timedelta(minutes=30)
+POLL_MAX = timedelta(hours=12)
+# Cron runs drift by a few minutes; don't skip a feed for arriving early.
+POLL_SLACK = timedelta(minutes=5)
+
+
+def record_publications(feed: Dict[str, Any], published: Iterable[datetime]) -> None:
+    """Merge newly seen publication times into the feed's cadence history."""
+    cadence = feed.setdefault("cadence", {})
+    times = {t for t in (parse_ts(v) for v in cadence.get("recent", []) or []) if t}
+    times.update(t.astimezone(timezone.utc) for t in published)
+    recent = sorted(times, reverse=True)[:CADENCE_SAMPLES]
+    cadence["recent"] = [t.isoformat() for t in recent]
+
+    interval = publication_interval(recent)
+    if interval is None:
+        cadence.pop("interval_min", None)
+    else:
+        cadence["interval_min"] = round(interval.total_seconds() / 60, 1)
+
+
+def publication_interval(times: List[datetime]) -> Optional[timedelta]:
+    """Median gap between consecutive publications, or None without enough history."""
+    if len(times) < CADENCE_MIN_SAMPLES:
+        return None
+    ordered = sorted(times)
+    gaps = sorted(b - a for a, b in zip(ordered, ordered[1:]))
+    return gaps[len(gaps) // 2]
+
+
+def poll_interval(feed: Dict[str, Any]) -> timedelta:
+    minutes = (feed.get("cadence") or {}).get("interval_min")
+    if minutes is None:
+        return POLL_MIN
+    return max(POLL_MIN, min(POLL_MAX, timedelta(minutes=float(minutes)) * POLL_FRACTION))
+
+
+def is_feed_due(feed: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """True if the feed has never been checked or its poll interval has elapsed."""
+    checked_at = parse_ts(feed.get("checked_at"))
+    if checked_at is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return now - checked_at >= poll_interval(feed) - POLL_SLACK
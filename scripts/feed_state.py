@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Persistent per-feed state for the RSS pipeline.
+
+Stored next to _data/rss_sources.json as _data/feed_state.json, keyed by feed URL:
+
+  {
+    "https://techcrunch.com/feed/": {
+      "etag": "...",               # validators for conditional GET
+      "last_modified": "...",
+      "seen_ids": ["...", ...],    # most recent entry IDs (newest first)
+      "checked_at": "2026-03-22T10:00:00+00:00",
+      "health": {...}              # see ai_news_filter.update_source_health
+    }
+  }
+
+Health measurements also drive a per-source circuit breaker: a feed that keeps
+failing (or keeps being slow) is skipped for an exponentially growing backoff
+window, and _data/source_health.yml is regenerated from the same data.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+FEED_STATE_FILE = REPO_ROOT / "_data" / "feed_state.json"
+SOURCE_HEALTH_FILE = REPO_ROOT / "_data" / "source_health.yml"
+
+# Circuit breaker: trip after this many consecutive failures (or slow fetches).
+SOURCE_FAILURE_THRESHOLD = 3
+SOURCE_SLOW_THRESHOLD = 3
+SOURCE_BACKOFF_BASE = timedelta(minutes=30)
+SOURCE_BACKOFF_MAX = timedelta(hours=24)
+
+
+def load_feed_state(path: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    path = path or FEED_STATE_FILE
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_feed_state(state: Dict[str, Dict[str, Any]], path: Optional[Path] = None) -> None:
+    path = path or FEED_STATE_FILE
+    atomic_write_text(path, json.dumps(state, indent=2, sort_keys=True))
+
+
+def conditional_headers(feed: Dict[str, Any]) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from stored validators."""
+    headers: Dict[str, str] = {}
+    if feed.get("etag"):
+        headers["If-None-Match"] = str(feed["etag"])
+    if feed.get("last_modified"):
+        headers["If-Modified-Since"] = str(feed["last_modified"])
+    return headers
+
+
+def record_validators(feed: Dict[str, Any], response_headers: Any) -> None:
+    """Remember ETag / Last-Modified from a 200 response (or drop stale ones)."""
+    etag = response_headers.get("ETag") if response_headers is not None else None
+    last_modified = response_headers.get("Last-Modified") if response_headers is not None else None
+    if etag:
+        feed["etag"] = etag
+    else:
+        feed.pop("etag", None)
+    if last_modified:
+        feed["last_modified"] = last_modified
+    else:
+        feed.pop("last_modified", None)
+
+
+def mark_checked(feed: Dict[str, Any]) -> None:
+    feed["checked_at"] = datetime.now(timezone.utc).isoformat()
+
+
+def parse_ts(value: Any) -> Optional[datetime]:
+    """Parse a stored ISO timestamp as an aware datetime (naive means UTC); None if unset or invalid."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value))
+    except Exception:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def circuit_open(health: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """True while a source is inside its backoff window and should be skipped."""
+    skip_until = parse_ts(health.get("skip_until"))
+    return bool(skip_until and skip_until > (now or datetime.now(timezone.utc)))
+
+
+def update_circuit(health: Dict[str, Any], *, slow_ms: float, now: Optional[datetime] = None) -> None:
+    """
+    Re-evaluate the breaker after a fetch has been recorded in `health`.
+    Backoff doubles with every strike past the threshold, capped at a day.
+    """
+    now = now or datetime.now(timezone.utc)
+    failures = int(health.get("consecutive_failures", 0) or 0)
+    if failures == 0 and float(health.get("latency_ms", 0) or 0) >= slow_ms:
+        health["slow_streak"] = int(health.get("slow_streak", 0) or 0) + 1
+    elif failures == 0:
+        health["slow_streak"] = 0
+
+    strikes = 0
+    if failures >= SOURCE_FAILURE_THRESHOLD:
+        strikes = failures - SOURCE_FAILURE_THRESHOLD + 1
+    elif int(health.get("slow_streak", 0) or 0) >= SOURCE_SLOW_THRESHOLD:
+        strikes = int(health["slow_streak"]) - SOURCE_SLOW_THRESHOLD + 1
+
+    if strikes:
+        backoff = min(SOURCE_BACKOFF_MAX, SOURCE_BACKOFF_BASE * (2 ** (strikes - 1)))
+        health["skip_until"] = (now + backoff).isoformat()
+    else:
+        health.pop("skip_until", None)
+
+
+def source_status(health: Dict[str, Any], now: Optional[datetime] = None) -> str:
+    if circuit_open(health, now):
+        return "skipped"
+    if int(health.get("consecutive_failures", 0) or 0) > 0:
+        return "failing"
+    if int(health.get("slow_streak", 0) or 0) > 0:
+        return "slow"
+    return "healthy"
+
+
+def _yaml_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def render_source_health(state: Dict[str, Dict[str, Any]], sources: Sequence[Tuple[str, str]]) -> str:
+    """Render _data/source_health.yml from measured per-feed health."""
+    now = datetime.now(timezone.utc)
+    lines = ["# _data/source_health.yml", "# Auto-generated by scripts/generate_news.py from measured fetches", ""]
+    for name, url in sources:
+        health = (state.get(url) or {}).get("health") or {}
+        if not health:
+            continue
+        attempts = int(health.get("attempts", 0) or 0)
+        successes = int(health.get("successes", 0) or 0)
+        avg_ms = health.get("avg_latency_ms")
+        fields = [
+            ("name", name),
+            ("url", url),
+            ("status", source_status(health, now)),
+            ("last_fetch", (health.get("last_fetch") or "")[:19].replace("T", " ")),
+            ("last_ok", (health.get("last_ok") or "")[:19].replace("T", " ") or None),
+            ("entries_last_fetch", int(health.get("entries", 0) or 0)),
+            ("bytes_last_fetch", int(health.get("bytes", 0) or 0)),
+            ("success_rate", round(100.0 * successes / attempts) if attempts else 0),
+            ("consecutive_failures", int(health.get("consecutive_failures", 0) or 0)),
+            ("avg_response_time", round(float(avg_ms) / 1000, 2) if avg_ms is not None else None),
+            ("skip_until", health.get("skip_until")),
+            ("last_error", health.get("last_error")),
+        ]
+        lines.append(f"- {fields[0][0]}: {_yaml_value(fields[0][1])}")
+        for key, value in fields[1:]:
+            lines.append(f"  {key}: {_yaml_value(value)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def save_source_health(
+    state: Dict[str, Dict[str, Any]],
+    sources: Sequence[Tuple[str, str]],
+    path: Optional[Path] = None,
+) -> None:
+    path = path or SOURCE_HEALTH_FILE
+    atomic_write_text(path, render_source_health(state, sources))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Streaming RSS/Atom entry reader.
+
+Feeds are parsed incrementally with ElementTree's pull parser, so entries are
+yielded as soon as their closing tag arrives and the caller can stop reading
+(and downloading) once it has what it needs. Each entry element is detached
+from the tree after it is yielded, which keeps memory flat for long feeds.
+
+Malformed XML raises xml.etree.ElementTree.ParseError; callers fall back to
+feedparser in that case.
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+ENTRY_TAGS = {"item", "entry"}
+ID_TAGS = ("guid", "id")
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+DATE_TAGS = ("pubDate", "published", "updated", "date", "issued", "modified")
+
+
+def _local(tag: Any) -> str:
+    tag = str(tag)
+    return tag.rsplit("}", 1)[-1] if "}" in tag else tag
+
+
+def _text(elem: ET.Element) -> str:
+    return "".join(elem.itertext()).strip()
+
+
+def _entry_link(elem: ET.Element) -> str:
+    fallback = ""
+    for child in elem:
+        if _local(child.tag) != "link":
+            continue
+        href = child.get("href")
+        if href is None:
+            text = (child.text or "").strip()
+            if text:
+                return text
+            continue
+        if child.get("rel") in (None, "alternate"):
+            return href.strip()
+        fallback = fallback or href.strip()
+    return fallback
+
+
+def entry_fields(elem: ET.Element) -> Dict[str, str]:
+    """Flatten an <item>/<entry> element into the fields the pipeline uses."""
+    children: Dict[str, List[ET.Element]] = {}
+    for child in elem:
+        children.setdefault(_local(child.tag), []).append(child)
+
+    def first(tags: Iterable[str]) -> str:
+        for tag in tags:
+            for child in children.get(tag, []):
+                value = _text(child)
+                if value:
+                    return value
+        return ""
+
+    link = _entry_link(elem)
+    return {
+        "id": first(ID_TAGS) or link,
+        "title": first(("title",)),
+        "link": link,
+        "summary": first(SUMMARY_TAGS),
+        "published": first(DATE_TAGS),
+    }
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[Dict[str, str]]:
+    """
+    Yield entry dicts (id, title, link, summary, published) from a stream of
+    byte chunks, in document order. Stops consuming `chunks` as soon as the
+    caller stops iterating.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    depth_in_entry = 0
+    found_root = False
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            is_entry = _local(elem.tag) in ENTRY_TAGS
+            if event == "start":
+                found_root = True
+                if depth_in_entry == 0:
+                    stack.append(elem)
+                if is_entry or depth_in_entry:
+                    depth_in_entry += 1
+                continue
+
+            if depth_in_entry:
+                depth_in_entry -= 1
+                if depth_in_entry or not is_entry:
+                    continue
+                stack.pop()
+                yield entry_fields(elem)
+                # Detach the processed entry so the tree never holds the whole feed.
+                if stack:
+                    stack[-1].remove(elem)
+                continue
+
+            if stack:
+                parent: Optional[ET.Element] = stack.pop()
+                if stack and parent is not None:
+                    stack[-1].remove(parent)
+
+    parser.close()
+    if not found_root:
+        raise ET.ParseError("empty feed document")
@@ -3,6 +3,7 @@
 AI news link-post generator for the Jekyll blog.
 
 - Fetches recent AI-related stories via DuckDuckGo News (no API key required)
+  and the RSS feeds in _data/rss_sources.json, concurrently
 - Scores + dedupes stories using keyword rules in scripts/config.py
 - Writes minimal link-posts into _posts/
 - Updates data/news_queue.json and _data/run_log.json
@@ -13,27 +14,60 @@ GitHub Action entrypoint: .github/workflows/daily-news.yml
 from __future__ import annotations
 
 import argparse
+import copy
 import hashlib
 import html
 import json
 import os
+import random
 import re
 import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 # Ensure repo root is importable when running as a script.
 REPO_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(REPO_ROOT))
 
-from scripts.config import detect_companies, detect_topics, get_company_tier
+from scripts.ai_news_filter import update_source_health
+from scripts.classify_cache import ClassifyCache, content_key
+from scripts.clustering import StoryClusters
+from scripts.config import canonicalize_url, classify_batch, keyword_config_version
+from scripts.dedup import TitleIndex
+from scripts.feed_state import (
+    circuit_open,
+    conditional_headers,
+    load_feed_state,
+    mark_checked,
+    record_validators,
+    save_feed_state,
+    save_source_health,
+    update_circuit,
+)
+from scripts.feed_scheduler import is_feed_due, record_publications
+from scripts.feed_stream import iter_feed_entries
+from scripts.public_queue import paginate, write_public_queue
+from scripts.queue_store import QUEUE_DB_FILE, QueueStore, entry_key
+from scripts.scoring import load_scoring_rules
+from scripts.search_index import update_search_index
+from scripts.stats import RunStats
+from scripts.storage import append_run_log, atomic_write_text
+from scripts.url_index import UrlIndex
 
 
 POSTS_DIR = REPO_ROOT / "_posts"
 QUEUE_FILE = REPO_ROOT / "data" / "news_queue.json"
-RUN_LOG_FILE = REPO_ROOT / "_data" / "run_log.json"
-PUBLIC_QUEUE_FILE = REPO_ROOT / "_data" / "news_queue_public.json"
+RSS_SOURCES_FILE = REPO_ROOT / "_data" / "rss_sources.json"
 
 
 DEFAULT_SEARCH_QUERIES = [
@@ -43,23 +77,41 @@ DEFAULT_SEARCH_QUERIES = [
 ]
 
 
-AI_GENERIC_HINTS = [
-    "artificial intelligence",
-    "generative ai",
-    "genai",
-    "large language model",
-    "llm",
-    "foundation model",
-    "chatbot",
-    "ai agent",
-]
-
-
 def now_ist_str() -> str:
     ist = timezone(timedelta(hours=5, minutes=30))
     return datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S IST")
 
 
+class StageTimer:
+    """Accumulates wall time per pipeline stage (milliseconds) for the run log."""
+
+    def __init__(self) -> None:
+        self.ms: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+
+    def start(self, name: str) -> None:
+        self._started[name] = time.perf_counter()
+
+    def stop(self, name: str) -> None:
+        started = self._started.pop(name, None)
+        if started is not None:
+            self.ms[name] = self.ms.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def add(self, name: str, ms: float) -> None:
+        self.ms[name] = self.ms.get(name, 0.0) + ms
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(ms, 2) for name, ms in self.ms.items()}
+
+
 def parse_any_date(s: str) -> Optional[datetime]:
     if not s:
         return None
@@ -77,18 +129,21 @@ def parse_any_date(s: str) -> Optional[datetime]:
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
+    except Exception:
+        pass
+
+    # RFC 822 dates, as used by RSS <pubDate>.
+    try:
+        dt = parsedate_to_datetime(s)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
     except Exception:
         return None
 
 
 def normalize_url(url: str) -> str:
-    url = (url or "").strip()
-    url = re.sub(r"#.*$", "", url)
-    url = re.sub(r"[?&]utm_[^=&]+=[^&]+", "", url, flags=re.IGNORECASE)
-    url = re.sub(r"[?&]ref=[^&]+", "", url, flags=re.IGNORECASE)
-    url = re.sub(r"[?&]source=[^&]+", "", url, flags=re.IGNORECASE)
-    url = re.sub(r"[?&]$", "", url)
-    return url
+    return canonicalize_url(url)
 
 
 def slugify(title: str, max_len: int = 70) -> str:
@@ -116,39 +171,44 @@ def title_similarity(a: str, b: str) -> float:
     return overlap / denom
 
 
-def load_queue() -> Dict[str, Any]:
-    if not QUEUE_FILE.exists():
-        return {
-            "queue": [],
-            "config": {"daily_post_limit": 5, "min_score_to_post": 50, "max_words_per_post": 200},
-            "pending": [],
-            "posted": [],
-            "daily_usage": [],
-        }
-    return json.loads(QUEUE_FILE.read_text())
+def load_posted_index(store: QueueStore) -> UrlIndex:
+    """
+    The persisted posted-URL index, rebuilt from the store only when its count
+    disagrees with the posted table (first run, manual queue edits).
+    """
+    index = UrlIndex.load()
+    if len(index) != store.posted_count():
+        index = UrlIndex.from_urls(store.posted_urls())
+    return index
+
 
+def load_run_stats(store: QueueStore) -> RunStats:
+    """Stored Status-page counters, seeded from the queue on first use."""
+    stats = RunStats.load()
+    if stats is None:
+        stats = RunStats.seed(store.posted(), store.pending())
+    return stats
 
-def save_queue(queue: Dict[str, Any]) -> None:
-    QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    QUEUE_FILE.write_text(json.dumps(queue, indent=2, sort_keys=False))
 
-def publish_public_queue(queue: Dict[str, Any]) -> None:
+def publish_public_queue(queue: Dict[str, Any], posted_urls: Optional[UrlIndex] = None) -> bool:
     """
     Publish a sanitized, deduplicated view of the queue for the UI.
-    GitHub Pages can read _data/*.json but not arbitrary /data files.
+    GitHub Pages can read _data/*.json but not arbitrary /data files, so the
+    first page goes there and the rest into assets/queue/ shards
+    (scripts/public_queue.py). Returns False (and leaves the files alone) when
+    the content is unchanged, so no-op runs don't trigger a commit and site
+    rebuild. The Archives search index (scripts/search_index.py) is kept in
+    step with the published items.
     """
-    posted = list(queue.get("posted", []) or [])
     pending = list(queue.get("pending", []) or [])
+    if posted_urls is None:
+        posted_urls = UrlIndex.from_urls(entry_key(p) for p in queue.get("posted", []) or [])
 
-    def _norm(u: str) -> str:
-        return normalize_url(u or "")
-
-    posted_urls: Set[str] = set(_norm(p.get("url", "")) for p in posted if p.get("url"))
     out_pending: List[Dict[str, Any]] = []
     seen: Set[str] = set()
 
     for item in pending:
-        url = _norm(item.get("url", ""))
+        url = entry_key(item)
         if not url or url in posted_urls or url in seen:
             continue
         seen.add(url)
@@ -171,33 +231,35 @@ def publish_public_queue(queue: Dict[str, Any]) -> None:
 
     out_pending = sorted(out_pending, key=_pending_sort_key, reverse=True)
 
-    payload = {
-        "updated_at_utc": datetime.now(timezone.utc).isoformat(),
-        "pending_count": len(out_pending),
-        # Keep large enough to include the full queue in the UI (Archives -> Queue).
-        # Jekyll reads _data/*.json at build time; keep this bounded to avoid runaway sizes.
-        "pending": out_pending[:2000],
-    }
-
-    PUBLIC_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    PUBLIC_QUEUE_FILE.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
-
-
-def load_run_log() -> List[Dict[str, Any]]:
-    if not RUN_LOG_FILE.exists():
-        return []
-    try:
-        return json.loads(RUN_LOG_FILE.read_text())
-    except Exception:
-        return []
-
-
-def save_run_log(entries: List[Dict[str, Any]]) -> None:
-    RUN_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    RUN_LOG_FILE.write_text(json.dumps(entries[-50:], indent=2, ensure_ascii=False))
-
-
-def write_run_log(*, candidates_found: int, posts_written: List[Dict[str, Any]], queued_count: int, feed_stats: Dict[str, Any]) -> None:
+    # Keep large enough to include the full queue in the UI (Archives -> Queue);
+    # only the first page is read by Jekyll, the rest is fetched on demand.
+    out_pending = out_pending[:2000]
+    changed = write_public_queue(out_pending)
+
+    # Posted entries from before "source" was stored fall back to the host, so
+    # they still match a search for e.g. "techcrunch".
+    out_posted = [
+        {
+            "url": entry_key(p),
+            "title": p.get("title", ""),
+            "source": p.get("source") or urllib.parse.urlsplit(entry_key(p)).hostname or "",
+            "companies": p.get("companies") or [],
+            "topics": p.get("topics") or [],
+        }
+        for p in queue.get("posted", []) or []
+    ]
+    pages = [page["items"] for page in paginate(out_pending)]
+    return update_search_index(out_posted, pages) or changed
+
+
+def write_run_log(
+    *,
+    candidates_found: int,
+    posts_written: List[Dict[str, Any]],
+    queued_count: int,
+    feed_stats: Dict[str, Any],
+    timings_ms: Optional[Dict[str, float]] = None,
+) -> None:
     event = os.environ.get("GITHUB_EVENT_NAME", "")
     if event == "schedule":
         triggered_by = "Scheduled"
@@ -213,6 +275,7 @@ def write_run_log(*, candidates_found: int, posts_written: List[Dict[str, Any]],
         "posts_created": len(posts_written),
         "queued": queued_count,
         "feeds": feed_stats,
+        "timings_ms": timings_ms or {},
         "posts": [
             {
                 "title": p.get("title", ""),
@@ -224,102 +287,187 @@ def write_run_log(*, candidates_found: int, posts_written: List[Dict[str, Any]],
         ],
     }
 
-    log = load_run_log()
-    log.append(entry)
-    save_run_log(log)
+    append_run_log(entry)
+
+
+def classify_relevance(pairs: Sequence[Tuple[str, str]]) -> List[Tuple[List[str], List[str]]]:
+    """is_ai_relevant for many (title, snippet) pairs, classified in one batch."""
+    out: List[Tuple[List[str], List[str]]] = []
+    for companies, topics, generic in classify_batch(pairs):
+        if companies or topics:
+            out.append((companies, topics))
+        elif generic:
+            out.append(([], ["ai"]))
+        else:
+            out.append(([], []))
+    return out
 
 
 def is_ai_relevant(title: str, snippet: str) -> Tuple[List[str], List[str]]:
-    combined = f"{title} {snippet}".strip()
-    companies = detect_companies(combined)
-    topics = detect_topics(combined)
-    if companies or topics:
-        return companies, topics
+    return classify_relevance([(title, snippet)])[0]
 
-    combined_lower = combined.lower()
-    if any(hint in combined_lower for hint in AI_GENERIC_HINTS):
-        return [], ["ai"]
 
-    return [], []
+# Compiled from data/scoring_rules.json; see scripts/scoring.py.
+SCORING_RULES = load_scoring_rules()
 
 
 def score_story(*, title: str, snippet: str, companies: Sequence[str], topics: Sequence[str], published_at: Optional[datetime]) -> int:
-    score = 0
+    return SCORING_RULES.score_batch([(title, snippet, companies, topics)], [published_at])[0]
 
-    if published_at:
-        age_days = (datetime.now(timezone.utc) - published_at).days
-        if age_days <= 0:
-            score += 25
-        elif age_days <= 1:
-            score += 22
-        elif age_days <= 3:
-            score += 16
-        elif age_days <= 7:
-            score += 10
-        else:
-            score -= 15
-
-    title_lower = (title or "").lower()
-    combined_lower = f"{title} {snippet}".lower()
-
-    for c in companies:
-        tier = get_company_tier(c)
-        score += 18 if tier == 1 else 10
-        if c in title_lower:
-            score += 6
-
-    for t in topics:
-        score += 3 if t == "ai" else 8
-        if t in title_lower:
-            score += 3
-
-    if any(
-        k in combined_lower
-        for k in (
-            "release",
-            "launch",
-            "announc",
-            "introduc",
-            "open-sourc",
-            "weights",
-            "funding",
-            "raises",
-            "acquires",
-            "partnership",
-            "policy",
-            "regulation",
-            "ban",
-        )
-    ):
-        score += 6
-    if any(k in combined_lower for k in ("rumor", "leak", "reportedly", "unconfirmed")):
-        score -= 4
 
-    return max(0, min(100, score))
+class HttpNewsClient:
+    """
+    Minimal DDGS stand-in that reads DDG-shaped JSON results over HTTP.
+    Selected by setting NEWS_DDG_ENDPOINT (used by scripts/bench_pipeline.py to
+    point the pipeline at scripts/mock_news_server.py instead of DuckDuckGo).
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 20.0) -> None:
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def __enter__(self) -> "HttpNewsClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def news(self, keywords: str, max_results: Optional[int] = None, timelimit: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = urllib.parse.urlencode({"q": keywords, "max_results": max_results or 0, "timelimit": timelimit or ""})
+        request = urllib.request.Request(f"{self.endpoint}?{query}", headers={"User-Agent": RSS_USER_AGENT})
+        with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+            return list(json.loads(resp.read().decode("utf-8")))
+
 
+DDG_MAX_WORKERS = 3
+DDG_MAX_ATTEMPTS = 3
+DDG_BACKOFF_BASE = 1.0
+DDG_BACKOFF_MAX = 8.0
+# After this many rate-limited responses across all queries, stop asking DDG
+# and let RSS take over instead of sitting through every query's backoff.
+DDG_FAST_FAIL_AFTER = 2
+
+RATE_LIMIT_MARKERS = ("ratelimit", "rate limit", "too many requests", "forbidden", "blocked")
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Best-effort detection of DDG rate-limit / block responses across client versions."""
+    code = getattr(exc, "code", None) or getattr(exc, "status", None)
+    if code in (202, 403, 429):
+        return True
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+def load_ddg_client() -> Any:
+    endpoint = os.environ.get("NEWS_DDG_ENDPOINT", "").strip()
+    if endpoint:
+        return lambda: HttpNewsClient(endpoint)
 
-def fetch_ddg_news(*, queries: Sequence[str], max_results_per_query: int, timelimit: str) -> List[Dict[str, Any]]:
-    DDGS = None
     # duckduckgo-search was renamed to ddgs; support both.
     try:
         from ddgs import DDGS as _DDGS  # type: ignore
 
-        DDGS = _DDGS
+        return _DDGS
     except Exception:
         try:
             from duckduckgo_search import DDGS as _DDGS  # type: ignore
 
-            DDGS = _DDGS
+            return _DDGS
         except Exception as e:
             raise RuntimeError("DDG client missing. Install with: pip install ddgs duckduckgo-search") from e
 
+
+def run_ddg_query(
+    DDGS: Any,
+    query: str,
+    *,
+    max_results: int,
+    timelimit: str,
+    blocked: threading.Event,
+    rate_limit_hits: List[int],
+    lock: threading.Lock,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run one DDG query with jittered exponential backoff on rate limiting.
+    Returns (raw_results, stat) where stat records outcome, attempts and latency.
+    """
+    start = time.perf_counter()
+    stat: Dict[str, Any] = {"query": query, "outcome": "aborted", "attempts": 0, "results": 0}
+    items: List[Dict[str, Any]] = []
+
+    for attempt in range(DDG_MAX_ATTEMPTS):
+        if blocked.is_set():
+            break
+        stat["attempts"] = attempt + 1
+        try:
+            # One client per query: DDGS sessions aren't safe to share across threads.
+            with DDGS() as ddgs:
+                items = list(ddgs.news(keywords=query, max_results=max_results, timelimit=timelimit) or [])
+            stat["outcome"] = "ok" if items else "empty"
+            break
+        except Exception as e:
+            stat["error"] = f"{type(e).__name__}: {e}"[:200]
+            if not is_rate_limited(e):
+                stat["outcome"] = "error"
+                break
+            stat["outcome"] = "rate_limited"
+            with lock:
+                rate_limit_hits[0] += 1
+                if rate_limit_hits[0] >= DDG_FAST_FAIL_AFTER:
+                    blocked.set()
+            if attempt + 1 < DDG_MAX_ATTEMPTS:
+                # Full jitter; waiting on the event lets a fast-fail cut the sleep short.
+                blocked.wait(random.uniform(0, min(DDG_BACKOFF_MAX, DDG_BACKOFF_BASE * (2 ** attempt))))
+
+    stat["results"] = len(items)
+    stat["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return items, stat
+
+
+def fetch_ddg_news(
+    *,
+    queries: Sequence[str],
+    max_results_per_query: int,
+    timelimit: str,
+    max_workers: int = DDG_MAX_WORKERS,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run DDG News queries with bounded parallelism.
+
+    Rate-limit/block responses are retried with jittered exponential backoff;
+    once DDG_FAST_FAIL_AFTER of them have been seen the remaining queries give
+    up immediately so the run can hand off to RSS. Results are merged in query
+    order and deduped by normalized URL. Returns (results, stats) where stats
+    carries per-query outcome and latency for the run log.
+    """
+    DDGS = load_ddg_client()
+
     results: List[Dict[str, Any]] = []
     seen: Set[str] = set()
-
-    with DDGS() as ddgs:
-        for query in queries:
-            try:
-                items = ddgs.news(keywords=query, max_results=max_results_per_query, timelimit=timelimit)
+    blocked = threading.Event()
+    rate_limit_hits = [0]
+    lock = threading.Lock()
+    per_query: List[Dict[str, Any]] = []
+
+    if queries:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as pool:
+            futures = [
+                pool.submit(
+                    run_ddg_query,
+                    DDGS,
+                    query,
+                    max_results=max_results_per_query,
+                    timelimit=timelimit,
+                    blocked=blocked,
+                    rate_limit_hits=rate_limit_hits,
+                    lock=lock,
+                )
+                for query in queries
+            ]
+            for future in futures:
+                items, stat = future.result()
+                per_query.append(stat)
                 for r in items:
                     url = normalize_url(r.get("url", ""))
                     title = html.unescape((r.get("title", "") or "").strip())
@@ -337,10 +485,14 @@ def fetch_ddg_news(*, queries: Sequence[str], max_results_per_query: int, timeli
                             "snippet": html.unescape((r.get("body", "") or "").strip()),
                         }
                     )
-            except Exception:
-                continue
 
-    return results
+    stats: Dict[str, Any] = {
+        "queries": len(queries),
+        "raw": len(results),
+        "rate_limited": blocked.is_set(),
+        "per_query": per_query,
+    }
+    return results, stats
 
 
 DEFAULT_RSS_FEEDS: Sequence[Tuple[str, str]] = [
@@ -362,7 +514,7 @@ def load_rss_sources() -> Sequence[Tuple[str, str]]:
     Load RSS sources from _data/rss_sources.json if present, otherwise fall back.
     Kept in _data so Jekyll can render the same list on /sources/.
     """
-    sources_file = REPO_ROOT / "_data" / "rss_sources.json"
+    sources_file = RSS_SOURCES_FILE
     if not sources_file.exists():
         return DEFAULT_RSS_FEEDS
 
@@ -379,64 +531,352 @@ def load_rss_sources() -> Sequence[Tuple[str, str]]:
         return DEFAULT_RSS_FEEDS
 
 
-def fetch_rss_news(*, max_age_days: int = 7) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+RSS_MAX_WORKERS = 8
+RSS_FEED_TIMEOUT = 20.0
+# A fetch taking this fraction of the timeout counts towards the "slow" breaker.
+RSS_SLOW_FRACTION = 0.5
+RSS_USER_AGENT = "Mozilla/5.0 (compatible; jobysblog-news-bot/1.0; +https://knowjoby.github.io/blog)"
+
+
+FEED_CHUNK_SIZE = 16 * 1024
+FEED_SEEN_IDS_LIMIT = 200
+# Consecutive already-seen (or past-cutoff) entries after which the rest of a feed
+# is skipped. More than one so a single updated item bumped to the top, or one
+# out-of-order old item, doesn't hide newer entries below it.
+FEED_CURSOR_STOP_RUN = 3
+
+
+def read_feed_chunks(resp: Any, *, url: str, timeout: float, deadline: float) -> Iterator[bytes]:
+    """
+    Yield a response body in chunks, giving up once the total `deadline` passes.
+    urllib's timeout only bounds individual socket operations, so a slow-drip
+    server is cut off here instead.
+    """
+    while True:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"feed exceeded {timeout:.0f}s: {url}")
+        chunk = resp.read(FEED_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def open_feed(url: str, *, timeout: float, headers: Optional[Dict[str, str]] = None) -> Any:
+    """Open a feed URL; returns None on 304 Not Modified."""
+    request = urllib.request.Request(url, headers={"User-Agent": RSS_USER_AGENT, **(headers or {})})
     try:
-        import feedparser  # type: ignore
+        return urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+
+
+def entry_id(entry: Dict[str, str]) -> str:
+    return (entry.get("id") or entry.get("link") or "").strip()
+
+
+def feedparser_entries(body: bytes) -> List[Dict[str, str]]:
+    """Fallback for feeds the streaming parser rejects (feedparser is far more lenient)."""
+    import feedparser  # type: ignore
+
+    parsed = feedparser.parse(body)
+    if getattr(parsed, "bozo", 0):
+        # bozo=1 indicates a parse issue, but entries may still exist.
+        pass
+
+    out: List[Dict[str, str]] = []
+    for entry in getattr(parsed, "entries", []) or []:
+        link = str(getattr(entry, "link", "") or "")
+        out.append(
+            {
+                "id": str(getattr(entry, "id", "") or link),
+                "title": str(getattr(entry, "title", "") or ""),
+                "link": link,
+                "summary": str(getattr(entry, "summary", "") or ""),
+                "published": str(
+                    getattr(entry, "published", "")
+                    or getattr(entry, "updated", "")
+                    or getattr(entry, "pubDate", "")
+                    or ""
+                ),
+            }
+        )
+    return out
+
+
+def collect_feed_items(
+    entries: Iterable[Dict[str, str]],
+    *,
+    source: str,
+    cutoff: datetime,
+    feed: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Turn raw feed entries into pipeline items, stopping as early as possible.
+
+    Entries already seen on an earlier run are skipped before any unescaping or
+    date parsing, and a run of consecutive seen entries means we've reached the
+    previously processed tail of the feed. Likewise a run of entries older than
+    `cutoff` ends the scan. Returns (items, entries_read).
+    """
+    previous_ids: List[str] = list(feed.get("seen_ids") or [])
+    previous: Set[str] = set(previous_ids)
+    head_ids: List[str] = []
+    published_times: List[datetime] = []
+    seen_run = 0
+    stale_run = 0
+    entries_read = 0
+
+    items: List[Dict[str, Any]] = []
+    for entry in entries:
+        entries_read += 1
+        eid = entry_id(entry)
+        if eid and eid in previous:
+            seen_run += 1
+            if seen_run >= FEED_CURSOR_STOP_RUN:
+                break
+            continue
+        seen_run = 0
+        if eid:
+            head_ids.append(eid)
+
+        published_at = parse_any_date(entry.get("published", ""))
+        if published_at:
+            published_times.append(published_at)
+        if published_at and published_at < cutoff:
+            stale_run += 1
+            if stale_run >= FEED_CURSOR_STOP_RUN:
+                break
+            continue
+        stale_run = 0
+
+        title = html.unescape((entry.get("title") or "").strip())
+        link = normalize_url((entry.get("link") or "").strip())
+        if not title or not link:
+            continue
+
+        summary = html.unescape((entry.get("summary") or "").strip())
+        items.append(
+            {
+                "title": title,
+                "url": link,
+                "source": source,
+                "date": published_at.isoformat() if published_at else "",
+                "snippet": summary[:300],
+            }
+        )
+
+    feed["seen_ids"] = list(dict.fromkeys(head_ids + previous_ids))[:FEED_SEEN_IDS_LIMIT]
+    record_publications(feed, published_times)
+    return items, entries_read
+
+
+def fetch_feed_entries(
+    source: str,
+    url: str,
+    *,
+    cutoff: datetime,
+    timeout: float,
+    feed: Dict[str, Any],
+    metrics: Optional[Dict[str, Any]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch and parse a single feed. Raises on network/parse failure.
+
+    The body is parsed as it downloads (scripts/feed_stream.py) and the download
+    stops once the cursor or the age cutoff is reached; feedparser is only used
+    when the XML is too malformed for the streaming parser.
+
+    `feed` is this source's entry in _data/feed_state.json; it is updated in place
+    with the response validators and the IDs seen. Only entries newer than the
+    stored cursor are returned. Returns None when the server answered 304 Not
+    Modified (nothing is parsed in that case).
+
+    `metrics`, if given, receives bytes_read and entries for health tracking.
+    """
+    if metrics is None:
+        metrics = {}
+    metrics.update(bytes_read=0, entries=0)
+
+    deadline = time.monotonic() + timeout
+    resp = open_feed(url, timeout=timeout, headers=conditional_headers(feed))
+    if resp is None:
+        mark_checked(feed)
+        return None
+
+    with resp:
+        received: List[bytes] = []
+
+        def chunks() -> Iterator[bytes]:
+            for chunk in read_feed_chunks(resp, url=url, timeout=timeout, deadline=deadline):
+                received.append(chunk)
+                yield chunk
+
+        # Work on a scratch copy so a half-streamed feed that turns out to be
+        # malformed doesn't leave its partial cursor (or cadence) behind.
+        scratch = copy.deepcopy(feed)
+        try:
+            items, entries_read = collect_feed_items(iter_feed_entries(chunks()), source=source, cutoff=cutoff, feed=scratch)
+        except ET.ParseError:
+            received.extend(read_feed_chunks(resp, url=url, timeout=timeout, deadline=deadline))
+            scratch = copy.deepcopy(feed)
+            items, entries_read = collect_feed_items(feedparser_entries(b"".join(received)), source=source, cutoff=cutoff, feed=scratch)
+
+        metrics.update(bytes_read=sum(len(c) for c in received), entries=entries_read)
+        if not entries_read:
+            raise ValueError(f"no entries in feed: {url}")
+
+        feed.update(scratch)
+        record_validators(feed, resp.headers)
+        mark_checked(feed)
+        return items
+
+
+def fetch_feed_measured(
+    source: str,
+    url: str,
+    *,
+    cutoff: datetime,
+    timeout: float,
+    feed: Dict[str, Any],
+) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str], Dict[str, Any]]:
+    """Run fetch_feed_entries, capturing (items, error, metrics) instead of raising."""
+    metrics: Dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        items = fetch_feed_entries(source, url, cutoff=cutoff, timeout=timeout, feed=feed, metrics=metrics)
+        error = None
     except Exception as e:
-        raise RuntimeError("feedparser is required. Install with: pip install feedparser") from e
+        items, error = None, f"{type(e).__name__}: {e}"
+    metrics["latency_ms"] = (time.perf_counter() - start) * 1000
+    return items, error, metrics
+
+
+def fetch_rss_news(
+    *,
+    max_age_days: int = 7,
+    max_workers: int = RSS_MAX_WORKERS,
+    timeout: float = RSS_FEED_TIMEOUT,
+    feed_state: Optional[Dict[str, Dict[str, Any]]] = None,
+    all_feeds: bool = False,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Fetch all configured RSS feeds concurrently.
+
+    Feeds are downloaded on a bounded thread pool, each with its own timeout, so
+    one slow source no longer stalls the run. Results are merged in the order of
+    _data/rss_sources.json (not completion order) and deduped by normalized URL,
+    so output is deterministic regardless of network timing.
+
+    When `feed_state` is given, requests are conditional (ETag / Last-Modified)
+    and feeds answering 304 are skipped without parsing. Each fetch's latency,
+    bytes, entry count and outcome are recorded in the feed's "health" block, and
+    sources whose circuit breaker is open are not requested at all. Feeds that
+    are not yet due per their learned publication cadence (scripts/feed_scheduler.py)
+    are skipped too, unless `all_feeds` is set. The dict is updated in place; the
+    caller decides whether to persist it (not on --dry-run).
+    """
+    try:
+        import feedparser  # type: ignore  # noqa: F401
+    except Exception as e:
+        raise RuntimeError("feedparser is required (fallback parser). Install with: pip install feedparser") from e
 
-    rss_feeds = load_rss_sources()
+    rss_feeds = list(load_rss_sources())
     cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
     results: List[Dict[str, Any]] = []
     seen: Set[str] = set()
-    stats: Dict[str, Any] = {"feeds_total": len(rss_feeds), "feeds_ok": 0, "feeds_failed": 0}
+    stats: Dict[str, Any] = {
+        "feeds_total": len(rss_feeds),
+        "feeds_ok": 0,
+        "feeds_failed": 0,
+        "feeds_not_modified": 0,
+        "feeds_skipped": 0,
+        "feeds_not_due": 0,
+    }
+    if feed_state is None:
+        feed_state = {}
 
+    now = datetime.now(timezone.utc)
+    active: List[Tuple[str, str]] = []
     for source, url in rss_feeds:
-        try:
-            parsed = feedparser.parse(url)
-            if getattr(parsed, "bozo", 0):
-                # bozo=1 indicates a parse issue, but entries may still exist.
-                pass
-
-            entries = getattr(parsed, "entries", []) or []
-            if entries:
-                stats["feeds_ok"] += 1
-            else:
+        feed = feed_state.setdefault(url, {})
+        if circuit_open(feed.setdefault("health", {}), now):
+            stats["feeds_skipped"] += 1
+            continue
+        if not all_feeds and not is_feed_due(feed, now):
+            stats["feeds_not_due"] += 1
+            continue
+        active.append((source, url))
+
+    if not active:
+        return results, stats
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(active)))) as pool:
+        futures = [
+            pool.submit(
+                fetch_feed_measured,
+                source,
+                url,
+                cutoff=cutoff,
+                timeout=timeout,
+                feed=feed_state[url],
+            )
+            for source, url in active
+        ]
+        for (source, url), future in zip(active, futures):
+            items, error, metrics = future.result()
+            health = feed_state[url]["health"]
+            update_source_health(
+                source,
+                error is None,
+                {source: health},
+                latency_ms=metrics.get("latency_ms"),
+                bytes_read=metrics.get("bytes_read"),
+                entries=metrics.get("entries"),
+                error=error,
+            )
+            update_circuit(health, slow_ms=timeout * 1000 * RSS_SLOW_FRACTION)
+
+            if error is not None:
                 stats["feeds_failed"] += 1
+                continue
 
-            for entry in entries:
-                title = html.unescape((getattr(entry, "title", "") or "").strip())
-                link = normalize_url((getattr(entry, "link", "") or "").strip())
-                if not title or not link or link in seen:
+            stats["feeds_ok"] += 1
+            if items is None:
+                stats["feeds_not_modified"] += 1
+                continue
+            for item in items:
+                if item["url"] in seen:
                     continue
+                seen.add(item["url"])
+                results.append(item)
 
-                summary = html.unescape((getattr(entry, "summary", "") or "").strip())
+    return results, stats
 
-                published = (
-                    getattr(entry, "published", "")
-                    or getattr(entry, "updated", "")
-                    or getattr(entry, "pubDate", "")
-                    or ""
-                )
-                published_at = parse_any_date(str(published))
-                if published_at and published_at < cutoff:
-                    continue
 
-                seen.add(link)
-                results.append(
-                    {
-                        "title": title,
-                        "url": link,
-                        "source": source,
-                        "date": published_at.isoformat() if published_at else "",
-                        "snippet": summary[:300],
-                    }
-                )
-        except Exception:
-            stats["feeds_failed"] += 1
-            continue
+def fetch_all_sources(
+    providers: Dict[str, Callable[[], Tuple[List[Dict[str, Any]], Dict[str, Any]]]],
+) -> Iterator[Tuple[str, List[Dict[str, Any]], Dict[str, Any], float]]:
+    """
+    Run every provider concurrently and yield (name, raw, stats, elapsed_ms) in
+    completion order, so the caller can process the fastest source first.
+    A provider that raises yields no items and {"error": ...} stats.
+    """
 
-    return results, stats
+    def timed(fetch: Callable[[], Tuple[List[Dict[str, Any]], Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any], float]:
+        start = time.perf_counter()
+        try:
+            raw, stats = fetch()
+        except Exception as e:
+            raw, stats = [], {"error": str(e)}
+        return raw, stats, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=max(1, len(providers))) as pool:
+        futures = {pool.submit(timed, fetch): name for name, fetch in providers.items()}
+        for future in as_completed(futures):
+            raw, stats, elapsed_ms = future.result()
+            yield futures[future], raw, stats, elapsed_ms
 
 
 def ensure_unique_filename(date_prefix: str, base_slug: str, url: str) -> Path:
@@ -481,7 +921,7 @@ def write_link_post(*, title: str, url: str, source: str, tags: Sequence[str], s
     front_matter.append("---")
 
     body = f"[Read on {source or 'source'}]({url})\n"
-    filename.write_text("\n".join(front_matter) + "\n\n" + body)
+    atomic_write_text(filename, "\n".join(front_matter) + "\n\n" + body)
     return filename
 
 
@@ -489,132 +929,177 @@ def get_today_utc() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
 
-def daily_usage_entry(daily_usage: List[Dict[str, Any]], today: str) -> Dict[str, Any]:
-    for entry in daily_usage:
-        if entry.get("date") == today:
-            return entry
-    entry = {"date": today, "posts": 0, "items_processed": 0, "estimated_tokens": 0}
-    daily_usage.append(entry)
-    return entry
-
-
-def prune_old_pending(pending: List[Dict[str, Any]], *, keep_days: int) -> List[Dict[str, Any]]:
-    cutoff = datetime.now(timezone.utc).date() - timedelta(days=keep_days)
-    out: List[Dict[str, Any]] = []
-    for p in pending:
-        fetched_at = parse_any_date(str(p.get("fetched_at", "") or ""))
-        if fetched_at and fetched_at.date() < cutoff:
-            continue
-        out.append(p)
-    return out
-
-
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="Fetch, score, and publish AI news link posts.")
     parser.add_argument("--timelimit", default="w", help="DuckDuckGo News timelimit: d/w/m/y")
     parser.add_argument("--max-results-per-query", type=int, default=15)
     parser.add_argument("--dry-run", action="store_true", help="Do not write posts or update queue/run log.")
+    parser.add_argument("--all-feeds", action="store_true", help="Poll every RSS feed, ignoring the adaptive schedule.")
     args = parser.parse_args(list(argv) if argv is not None else None)
 
-    queue = load_queue()
-    config = queue.get("config", {}) or {}
+    timer = StageTimer()
+    with timer.stage("load"):
+        store = QueueStore.open(QUEUE_FILE, QUEUE_DB_FILE)
+    config = store.config()
 
     daily_post_limit = int(config.get("daily_post_limit", 5))
     min_score_to_post = int(config.get("min_score_to_post", 50))
 
-    pending: List[Dict[str, Any]] = list(queue.get("pending", []) or [])
-    posted: List[Dict[str, Any]] = list(queue.get("posted", []) or [])
-    daily_usage: List[Dict[str, Any]] = list(queue.get("daily_usage", []) or [])
-
     today = get_today_utc()
-    usage = daily_usage_entry(daily_usage, today)
+    usage = store.usage_for(today)
 
     remaining = max(0, daily_post_limit - int(usage.get("posts", 0) or 0))
     if remaining <= 0:
         if not args.dry_run:
-            write_run_log(candidates_found=0, posts_written=[], queued_count=len(pending), feed_stats={"ddg": {"skipped": True}})
-            queue["daily_usage"] = daily_usage
-            save_queue(queue)
-            publish_public_queue(queue)
+            write_run_log(candidates_found=0, posts_written=[], queued_count=store.pending_count(), feed_stats={"ddg": {"skipped": True}}, timings_ms=timer.as_dict())
+            with store.transaction():
+                store.upsert_daily_usage(usage)
+            run_stats = load_run_stats(store)
+            run_stats.record_run(day=today)
+            run_stats.save()
+            publish_public_queue(store.compact() if store.needs_compaction() else store.to_queue(), load_posted_index(store))
         return 0
 
-    known_urls: Set[str] = set()
-    known_titles: List[str] = []
-    for item in pending + posted:
-        url = normalize_url(item.get("url") or item.get("source_url") or "")
-        title = item.get("title", "") or ""
-        if url:
-            known_urls.add(url)
-        if title:
-            known_titles.append(title)
-
-    raw: List[Dict[str, Any]] = []
-    feed_stats: Dict[str, Any] = {"ddg": {}, "rss": {}}
+    # Everything below reads indexed columns from the queue store rather than
+    # walking the whole pending/posted history.
+    with timer.stage("load"):
+        # Pending is bounded by pruning; posted history is answered by the
+        # persisted Bloom/sorted-hash index instead of a rebuilt set.
+        pending_urls: Set[str] = store.pending_urls()
+        posted_index = load_posted_index(store)
+        title_index = TitleIndex.load(store.titles())
+        feed_state = load_feed_state()
+        classify_cache = ClassifyCache.load(f"{keyword_config_version()}:{SCORING_RULES.version}")
+        story_clusters = StoryClusters.load()
+        window_start = (datetime.now(timezone.utc).date() - timedelta(days=story_clusters.window_days)).isoformat()
+        story_clusters.sync_queue(store.recent("posted", window_start), date_field="posted_at")
+        story_clusters.sync_queue(store.recent("pending", window_start), date_field="fetched_at")
+        run_stats = load_run_stats(store)
 
-    try:
-        raw = fetch_ddg_news(
+    feed_stats: Dict[str, Any] = {"ddg": {}, "rss": {}}
+    providers = {
+        "ddg": lambda: fetch_ddg_news(
             queries=DEFAULT_SEARCH_QUERIES,
             max_results_per_query=args.max_results_per_query,
             timelimit=args.timelimit,
-        )
-        feed_stats["ddg"] = {"queries": len(DEFAULT_SEARCH_QUERIES), "raw": len(raw)}
-    except Exception as e:
-        feed_stats["ddg"] = {"error": str(e)}
-
-    # GitHub-hosted runners sometimes get blocked by DDG; RSS is the reliable fallback.
-    if not raw:
-        try:
-            raw, rss_stats = fetch_rss_news(max_age_days=7)
-            feed_stats["rss"] = {"raw": len(raw), **rss_stats}
-        except Exception as e:
-            feed_stats["rss"] = {"error": str(e)}
+        ),
+        "rss": lambda: fetch_rss_news(max_age_days=7, feed_state=feed_state, all_feeds=args.all_feeds),
+    }
 
+    raw_count = 0
+    cluster_skipped = 0
+    seen_raw: Set[str] = set()
     candidates: List[Dict[str, Any]] = []
-    for r in raw:
-        url = normalize_url(r.get("url", ""))
-        if not url or url in known_urls:
-            continue
-
-        title = r.get("title", "")
-        snippet = r.get("snippet", "")
-        source = r.get("source", "")
-        published_at = parse_any_date(r.get("date", ""))
-
-        companies, topics = is_ai_relevant(title, snippet)
-        if not companies and not topics:
-            continue
-
-        score = score_story(title=title, snippet=snippet, companies=companies, topics=topics, published_at=published_at)
-        if score < 10:
-            continue
-
-        if any(title_similarity(title, t) >= 0.65 for t in known_titles):
-            continue
+    candidates_by_provider: Dict[str, int] = {name: 0 for name in providers}
+
+    # Both providers run concurrently; whichever finishes first is classified and
+    # scored while the other is still fetching. GitHub-hosted runners sometimes
+    # get blocked by DDG, so RSS is always fetched rather than only as a fallback.
+    for name, raw, provider_stats, elapsed_ms in fetch_all_sources(providers):
+        timer.add(f"fetch_{name}", elapsed_ms)
+        feed_stats[name] = {"raw": len(raw), **provider_stats}
+        raw_count += len(raw)
+
+        fresh: List[Tuple[str, Dict[str, Any]]] = []
+        with timer.stage("dedup"):
+            for r in raw:
+                url = normalize_url(r.get("url", ""))
+                if not url or url in seen_raw or url in pending_urls or url in posted_index:
+                    continue
+                seen_raw.add(url)
+                fresh.append((url, r))
+
+        # Classification and the age-independent score come from the cache when
+        # this exact title/snippet was seen on an earlier run; misses are
+        # classified in one batch and scored once.
+        with timer.stage("classify"):
+            keys = [content_key(r.get("title", ""), r.get("snippet", "")) for _, r in fresh]
+            cached = [classify_cache.get(key) for key in keys]
+            misses = [i for i, hit in enumerate(cached) if hit is None]
+            relevance = classify_relevance([(fresh[i][1].get("title", ""), fresh[i][1].get("snippet", "")) for i in misses])
+        # Scores for the whole batch at once: base terms for cache misses, then
+        # the age term for everything relevant.
+        with timer.stage("score"):
+            relevant_misses = [(i, c, t) for i, (c, t) in zip(misses, relevance) if c or t]
+            bases = SCORING_RULES.base_scores(
+                [(fresh[i][1].get("title", ""), fresh[i][1].get("snippet", ""), c, t) for i, c, t in relevant_misses]
+            )
+            base_by_index = {i: base for (i, _, _), base in zip(relevant_misses, bases)}
+            for i, (companies, topics) in zip(misses, relevance):
+                base = base_by_index.get(i)
+                classify_cache.put(keys[i], companies, topics, base)
+                cached[i] = (companies, topics, base)
+
+        # Group relevant items into cross-source story clusters. Clusters that
+        # already have a queued representative are coverage of a known story;
+        # every member of the others is scored, and the best one that passes
+        # the score floor and the near-duplicate checks is queued for it.
+        dates = [parse_any_date(r.get("date", "")) for _, r in fresh]
+        with timer.stage("cluster"):
+            relevant_all = [i for i, (c, t, _) in enumerate(cached) if c or t]
+            cluster_ids = story_clusters.assign_batch(
+                [(fresh[i][0], fresh[i][1].get("title", ""), fresh[i][1].get("snippet", "")) for i in relevant_all]
+            )
+            members: Dict[str, List[int]] = {}
+            for i, cluster_id in zip(relevant_all, cluster_ids):
+                if story_clusters.representative(cluster_id) is None:
+                    members.setdefault(cluster_id, []).append(i)
+            relevant = sorted(i for group in members.values() for i in group)
+            cluster_skipped += len(relevant_all) - len(relevant)
+
+        with timer.stage("score"):
+            scores = dict(zip(relevant, SCORING_RULES.combine(
+                SCORING_RULES.age_scores([dates[i] for i in relevant]),
+                [int(cached[i][2] or 0) for i in relevant],
+            )))
+
+        def member_order(i: int) -> Tuple[int, float, int]:
+            # Highest score first, then earliest published.
+            published_at = dates[i]
+            return (-scores[i], published_at.timestamp() if published_at else float("inf"), i)
+
+        for cluster_id, group in members.items():
+            for i in sorted(group, key=member_order):
+                url, r = fresh[i]
+                companies, topics, _ = cached[i]
+                title = r.get("title", "")
+                score = scores[i]
+                if score < 10:
+                    break  # the rest of the cluster scores lower still
+
+                with timer.stage("dedup"):
+                    if title_index.is_duplicate(title):
+                        continue
 
-        candidates.append(
-            {
-                "title": title,
-                "url": url,
-                "source": source,
-                "published_at": published_at.isoformat() if published_at else "",
-                "companies": companies,
-                "topics": topics,
-                "score": score,
-            }
-        )
+                published_at = dates[i]
+                candidates.append(
+                    {
+                        "title": title,
+                        "url": url,
+                        "source": r.get("source", ""),
+                        "published_at": published_at.isoformat() if published_at else "",
+                        "companies": companies,
+                        "topics": topics,
+                        "score": score,
+                    }
+                )
+                candidates_by_provider[name] += 1
 
-        known_urls.add(url)
-        known_titles.append(title)
+                title_index.add(title)
+                story_clusters.set_representative(cluster_id, url)
+                cluster_skipped += len(group) - 1
+                break
 
     def sort_key(c: Dict[str, Any]) -> Tuple[int, int]:
         dt = parse_any_date(c.get("published_at", "")) or datetime(1970, 1, 1, tzinfo=timezone.utc)
         return (int(c.get("score", 0)), int(dt.timestamp()))
 
     candidates = sorted(candidates, key=sort_key, reverse=True)
-    usage["items_processed"] = int(usage.get("items_processed", 0) or 0) + len(raw)
+    usage["items_processed"] = int(usage.get("items_processed", 0) or 0) + raw_count
 
     posts_written: List[Dict[str, Any]] = []
-    queued_count_before = len(pending)
+    new_posted: List[Dict[str, Any]] = []
+    timer.start("publish")
 
     for c in candidates:
         if remaining <= 0:
@@ -642,10 +1127,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             "score": int(c["score"]),
             "file": str(written_path.relative_to(REPO_ROOT)),
             "posted_at": today,
+            "source": c.get("source", ""),
             "companies": list(c["companies"]),
             "topics": list(c["topics"]),
+            "canonical_url": c["url"],
         }
-        posted.append(posted_entry)
+        new_posted.append(posted_entry)
 
         posts_written.append(
             {
@@ -658,11 +1145,12 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         usage["posts"] = int(usage.get("posts", 0) or 0) + 1
         remaining -= 1
 
-    posted_urls = {normalize_url(p.get("url", "")) for p in posted}
+    posted_urls = {p["canonical_url"] for p in new_posted}
+    new_pending: List[Dict[str, Any]] = []
     for c in candidates:
-        if normalize_url(c["url"]) in posted_urls:
+        if c["url"] in posted_urls:
             continue
-        pending.append(
+        new_pending.append(
             {
                 "title": c["title"],
                 "url": c["url"],
@@ -673,35 +1161,62 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                 "topics": list(c["topics"]),
                 "company": (list(c["companies"]) or [""])[0],
                 "topic": (list(c["topics"]) or [""])[0],
+                "canonical_url": c["url"],
             }
         )
 
-    pending = prune_old_pending(pending, keep_days=14)
-    pending = sorted(pending, key=lambda x: int(x.get("score", 0) or 0), reverse=True)
+    queued_added = 0
+    if not args.dry_run:
+        # One transaction: posted rows, pending upserts and pruning (an indexed
+        # DELETE on fetched_at) land together or not at all.
+        with store.transaction():
+            queued_count_before = store.pending_count()
+            for entry in new_posted:
+                store.add_posted(entry)
+                posted_index.add(entry["canonical_url"])
+            store.upsert_pending(new_pending)
+            store.prune_pending(keep_days=14)
+            store.set_config(
+                {
+                    "daily_post_limit": daily_post_limit,
+                    "min_score_to_post": min_score_to_post,
+                    "max_words_per_post": int(config.get("max_words_per_post", 200)),
+                }
+            )
+            store.upsert_daily_usage(usage)
+            queued_added = max(0, store.pending_count() - queued_count_before)
 
-    queue["config"] = {
-        "daily_post_limit": daily_post_limit,
-        "min_score_to_post": min_score_to_post,
-        "max_words_per_post": int(config.get("max_words_per_post", 200)),
-    }
-    queue["pending"] = pending
-    queue["posted"] = posted
-    queue["daily_usage"] = daily_usage
-
-    feed_stats.setdefault("ddg", {})
-    feed_stats.setdefault("rss", {})
-    # Preserve earlier feed_stats and add candidates count.
-    if "ddg" in feed_stats and isinstance(feed_stats["ddg"], dict):
-        feed_stats["ddg"]["candidates"] = len(candidates)
-    if "rss" in feed_stats and isinstance(feed_stats["rss"], dict):
-        feed_stats["rss"]["candidates"] = len(candidates)
-    queued_after = len(pending)
-    queued_added = max(0, queued_after - queued_count_before)
+    # Candidates are attributed to the provider that delivered them first.
+    for name, count in candidates_by_provider.items():
+        feed_stats.setdefault(name, {})["candidates"] = count
+    feed_stats["classify_cache"] = classify_cache.stats()
+    feed_stats["clusters"] = {**story_clusters.stats(), "skipped": cluster_skipped}
 
     if not args.dry_run:
-        save_queue(queue)
-        publish_public_queue(queue)
-        write_run_log(candidates_found=len(candidates), posts_written=posts_written, queued_count=queued_added, feed_stats=feed_stats)
+        # This run's changes are already journaled; they are folded into the
+        # snapshot only on the compaction schedule.
+        queue = store.compact() if store.needs_compaction() else store.to_queue()
+        # Only after the queue is saved: otherwise a crash would leave feeds
+        # marked as seen (304 next time) without their entries being queued.
+        save_feed_state(feed_state)
+        save_source_health(feed_state, load_rss_sources())
+        classify_cache.save()
+        title_index.save()
+        story_clusters.save()
+        posted_index.save()
+        run_stats.record_run(day=today, raw=raw_count, candidates=len(candidates), posted=new_posted, queued=new_pending)
+        run_stats.save()
+        feed_stats["publish"] = {"changed": publish_public_queue(queue, posted_index)}
+    timer.stop("publish")
+
+    if not args.dry_run:
+        write_run_log(
+            candidates_found=len(candidates),
+            posts_written=posts_written,
+            queued_count=queued_added,
+            feed_stats=feed_stats,
+            timings_ms=timer.as_dict(),
+        )
 
     return 0
 
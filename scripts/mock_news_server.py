@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Mock News Server - local stand-in for RSS/Atom feeds and DuckDuckGo News.
+
+Serves synthetic, deterministic content so the pipeline can be measured without
+touching live TechCrunch/Verge/DDG endpoints:
+
+  GET /feeds/<n>.xml        RSS 2.0 feed (every --atom-every'th feed is Atom)
+  GET /feeds/sources.json   rss_sources.json-shaped list of all mock feeds
+  GET /ddg/news?q=...       DDG-shaped JSON results (see HttpNewsClient); a
+                            --ddg-block-rate fraction is answered 429
+
+Feeds honour If-None-Match, so repeated runs exercise the 304 path.
+
+Usage:
+  python scripts/mock_news_server.py --feeds 100 --items-per-feed 200 --latency-ms 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+SUBJECTS = [
+    "OpenAI", "Anthropic", "Google DeepMind", "Microsoft", "Meta", "Nvidia",
+    "Mistral", "DeepSeek", "Hugging Face", "Apple", "Amazon", "xAI",
+    "A startup", "Researchers", "Regulators", "The EU",
+]
+ACTIONS = [
+    "releases", "announces", "launches", "unveils", "raises funding for",
+    "open-sources", "delays", "is reportedly building", "partners on", "bans",
+]
+OBJECTS = [
+    "a new reasoning model", "an AI agent framework", "a humanoid robot",
+    "a coding assistant", "a multimodal model", "GPU data centers",
+    "AI safety standards", "an open source LLM", "a chatbot for schools",
+    "a smartphone app", "a database migration tool", "quarterly earnings",
+]
+
+
+class MockNewsConfig:
+    def __init__(
+        self,
+        *,
+        feeds: int = 20,
+        items_per_feed: int = 100,
+        ddg_results: int = 15,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        ddg_block_rate: float = 0.0,
+        atom_every: int = 4,
+        max_age_days: int = 14,
+        seed: int = 42,
+    ) -> None:
+        self.feeds = feeds
+        self.items_per_feed = items_per_feed
+        self.ddg_results = ddg_results
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.ddg_block_rate = ddg_block_rate
+        self.atom_every = atom_every
+        self.max_age_days = max_age_days
+        self.seed = seed
+
+
+def synthetic_items(seed: str, count: int, *, now: datetime, max_age_days: int) -> List[Dict[str, Any]]:
+    """Deterministic newest-first items for a feed/query, spread over max_age_days."""
+    rng = random.Random(seed)
+    span = max(1, max_age_days * 24 * 60)
+    minutes = sorted((rng.randrange(span) for _ in range(count)))
+    items: List[Dict[str, Any]] = []
+    for i, age_min in enumerate(minutes):
+        title = f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(OBJECTS)}"
+        slug = hashlib.sha1(f"{seed}:{i}".encode("utf-8")).hexdigest()[:12]
+        items.append(
+            {
+                "title": f"{title} ({slug[:4]})",
+                "url": f"https://mock.example/{seed}/{slug}?utm_source=rss",
+                "id": f"urn:mock:{seed}:{slug}",
+                "published": now - timedelta(minutes=age_min),
+                "summary": f"{title}. Large language model and generative AI coverage, item {i}.",
+            }
+        )
+    return items
+
+
+def render_rss(name: str, items: List[Dict[str, Any]]) -> str:
+    parts = [f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>{escape(name)}</title>']
+    for it in items:
+        parts.append(
+            "<item>"
+            f"<title>{escape(it['title'])}</title>"
+            f"<link>{escape(it['url'])}</link>"
+            f"<guid>{escape(it['id'])}</guid>"
+            f"<pubDate>{format_datetime(it['published'])}</pubDate>"
+            f"<description>{escape(it['summary'])}</description>"
+            "</item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts)
+
+
+def render_atom(name: str, items: List[Dict[str, Any]]) -> str:
+    parts = [f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{escape(name)}</title>']
+    for it in items:
+        parts.append(
+            "<entry>"
+            f"<title>{escape(it['title'])}</title>"
+            f'<link rel="alternate" href="{escape(it["url"])}"/>'
+            f"<id>{escape(it['id'])}</id>"
+            f"<updated>{it['published'].isoformat()}</updated>"
+            f"<summary>{escape(it['summary'])}</summary>"
+            "</entry>"
+        )
+    parts.append("</feed>")
+    return "".join(parts)
+
+
+class MockNewsServer:
+    """Threaded HTTP server serving synthetic feeds and DDG results."""
+
+    def __init__(self, config: MockNewsConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+        self._feed_cache: Dict[int, Tuple[bytes, str]] = {}
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_sources(self) -> List[Dict[str, str]]:
+        return [
+            {"name": f"Mock Feed {n}", "url": f"{self.base_url}/feeds/{n}.xml"}
+            for n in range(self.config.feeds)
+        ]
+
+    def start(self) -> "MockNewsServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockNewsServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _feed(self, n: int) -> Tuple[bytes, str]:
+        if n not in self._feed_cache:
+            items = synthetic_items(f"feed{n}", self.config.items_per_feed, now=self.now, max_age_days=self.config.max_age_days)
+            name = f"Mock Feed {n}"
+            atom = self.config.atom_every > 0 and n % self.config.atom_every == self.config.atom_every - 1
+            body = (render_atom(name, items) if atom else render_rss(name, items)).encode("utf-8")
+            self._feed_cache[n] = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+        return self._feed_cache[n]
+
+    def _ddg(self, query: str, max_results: int) -> bytes:
+        count = min(self.config.ddg_results, max_results) if max_results else self.config.ddg_results
+        items = synthetic_items(f"ddg:{query}", count, now=self.now, max_age_days=self.config.max_age_days)
+        return json.dumps(
+            [
+                {
+                    "title": it["title"],
+                    "url": it["url"],
+                    "source": "Mock Search",
+                    "date": it["published"].isoformat(),
+                    "body": it["summary"],
+                }
+                for it in items
+            ]
+        ).encode("utf-8")
+
+    def _delay_and_fail(self) -> bool:
+        with self._rng_lock:
+            self.requests += 1
+            jitter = self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms) if self.config.jitter_ms else 0.0
+            fail = self._rng.random() < self.config.failure_rate
+        delay = max(0.0, self.config.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                return
+
+            def _send(self, code: int, body: bytes = b"", content_type: str = "text/plain", headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                if parsed.path == "/feeds/sources.json":
+                    self._send(200, json.dumps(server.feed_sources()).encode("utf-8"), "application/json")
+                    return
+
+                if server._delay_and_fail():
+                    self._send(503, b"mock failure")
+                    return
+
+                if parsed.path.startswith("/feeds/") and parsed.path.endswith(".xml"):
+                    try:
+                        n = int(parsed.path[len("/feeds/"):-len(".xml")])
+                    except ValueError:
+                        n = -1
+                    if not 0 <= n < server.config.feeds:
+                        self._send(404, b"no such feed")
+                        return
+                    body, etag = server._feed(n)
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, headers={"ETag": etag})
+                        return
+                    self._send(200, body, "application/rss+xml; charset=utf-8", {"ETag": etag})
+                    return
+
+                if parsed.path == "/ddg/news":
+                    with server._rng_lock:
+                        blocked = server._rng.random() < server.config.ddg_block_rate
+                    if blocked:
+                        self._send(429, b"Ratelimit")
+                        return
+                    qs = parse_qs(parsed.query)
+                    query = (qs.get("q") or [""])[0]
+                    try:
+                        max_results = int((qs.get("max_results") or ["0"])[0])
+                    except ValueError:
+                        max_results = 0
+                    self._send(200, server._ddg(query, max_results), "application/json")
+                    return
+
+                self._send(404, b"not found")
+
+        return Handler
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--feeds", type=int, default=20, help="Number of synthetic feeds")
+    parser.add_argument("--items-per-feed", type=int, default=100)
+    parser.add_argument("--ddg-results", type=int, default=15, help="Results per DDG query (0 simulates a blocked runner)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- latency jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--ddg-block-rate", type=float, default=0.0, help="Fraction of DDG requests answered 429 (rate limited)")
+    parser.add_argument("--atom-every", type=int, default=4, help="Every Nth feed is Atom instead of RSS (0 = none)")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def config_from_args(args: argparse.Namespace) -> MockNewsConfig:
+    return MockNewsConfig(
+        feeds=args.feeds,
+        items_per_feed=args.items_per_feed,
+        ddg_results=args.ddg_results,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        ddg_block_rate=args.ddg_block_rate,
+        atom_every=args.atom_every,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS/Atom feeds and DDG-shaped news results.")
+    add_config_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = MockNewsServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Mock news server on {server.base_url}")
+    print(f"  feeds:   {server.base_url}/feeds/sources.json")
+    print(f"  ddg:     NEWS_DDG_ENDPOINT={server.base_url}/ddg/news")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
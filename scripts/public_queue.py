@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Sharded public queue for the site.
+
+_data/news_queue_public.json stays small: the digest, counts, a manifest of
+page shards and the first PUBLIC_QUEUE_FIRST_PAGE items, which Jekyll renders
+into the home page and the first Archives "Read more" page. The rest of the
+queue lives in assets/queue/page-*.json, which archives.md fetches on demand.
+
+Pages hold at most PUBLIC_QUEUE_PAGE_SIZE items and never span two fetch
+days. New items only land in today's pages and pruning drops whole days, so
+older shards keep their content and file name from run to run; a shard is
+rewritten only when its own digest changes.
+
+  {"digest": ..., "updated_at_utc": ..., "pending_count": N,
+   "page_size": 100, "newest_fetched_at": "YYYY-MM-DD",
+   "pages": [{"file": "page-20261017-1.json", "date": ..., "count": ..., "digest": ...}, ...],
+   "pending": [first page items]}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+PUBLIC_QUEUE_FILE = REPO_ROOT / "_data" / "news_queue_public.json"
+PUBLIC_QUEUE_PAGES_DIR = REPO_ROOT / "assets" / "queue"
+
+PUBLIC_QUEUE_PAGE_SIZE = 100
+PUBLIC_QUEUE_FIRST_PAGE = 100
+PUBLIC_QUEUE_DIGEST_RE = re.compile(rb'^\{"digest":"([0-9a-f]+)"')
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def read_public_queue_digest(path: Optional[Path] = None) -> str:
+    """Digest of the published queue, read from the first bytes of the file."""
+    try:
+        with (path or PUBLIC_QUEUE_FILE).open("rb") as fh:
+            head = fh.read(256)
+    except OSError:
+        return ""
+    m = PUBLIC_QUEUE_DIGEST_RE.search(head)
+    return m.group(1).decode("ascii") if m else ""
+
+
+def paginate(items: Sequence[Dict[str, Any]], page_size: int = PUBLIC_QUEUE_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """Split newest-first items into day-aligned pages of at most page_size."""
+    pages: List[Dict[str, Any]] = []
+    for item in items:
+        date = str(item.get("fetched_at", "") or "")[:10]
+        last = pages[-1] if pages else None
+        if last is None or last["date"] != date or len(last["items"]) >= page_size:
+            part = 1 if last is None or last["date"] != date else last["part"] + 1
+            pages.append({"date": date, "part": part, "items": []})
+        pages[-1]["items"].append(item)
+    for page in pages:
+        stamp = page["date"].replace("-", "") or "undated"
+        page["file"] = f"page-{stamp}-{page['part']}.json"
+    return pages
+
+
+def write_public_queue(
+    items: Sequence[Dict[str, Any]],
+    *,
+    path: Optional[Path] = None,
+    pages_dir: Optional[Path] = None,
+    page_size: int = PUBLIC_QUEUE_PAGE_SIZE,
+) -> bool:
+    """
+    Write the manifest and any changed shards for newest-first `items`.
+    Returns False (writing nothing) when the content is unchanged.
+    """
+    path = path or PUBLIC_QUEUE_FILE
+    pages_dir = pages_dir or PUBLIC_QUEUE_PAGES_DIR
+
+    digest = _digest(f"{len(items)}:{page_size}:{_compact(list(items))}")
+    if digest == read_public_queue_digest(path):
+        return False
+
+    previous: Dict[str, str] = {}
+    try:
+        for page in json.loads(path.read_text()).get("pages", []) or []:
+            previous[str(page.get("file", ""))] = str(page.get("digest", ""))
+    except Exception:
+        previous = {}
+
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    manifest: List[Dict[str, Any]] = []
+    for page in paginate(items, page_size):
+        body = _compact(page["items"])
+        page_digest = _digest(body)
+        target = pages_dir / page["file"]
+        if previous.get(page["file"]) != page_digest or not target.exists():
+            atomic_write_text(target, body + "\n")
+        manifest.append({"file": page["file"], "date": page["date"], "count": len(page["items"]), "digest": page_digest})
+
+    keep = {page["file"] for page in manifest}
+    for stale in pages_dir.glob("page-*.json"):
+        if stale.name not in keep:
+            stale.unlink()
+
+    # The digest leads the file so the next run can compare it without parsing
+    # the rest; updated_at_utc therefore marks the last real change.
+    payload = {
+        "digest": digest,
+        "updated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "pending_count": len(items),
+        "page_size": page_size,
+        "newest_fetched_at": str(items[0].get("fetched_at", "") or "") if items else "",
+        "pages": manifest,
+        "pending": list(items[:PUBLIC_QUEUE_FIRST_PAGE]),
+    }
+    atomic_write_text(path, _compact(payload) + "\n")
+    return True
@@ -2,23 +2,32 @@
 """
 Queue Status - inspect and maintain data/news_queue.json.
 
+Reads through the SQLite queue store (scripts/queue_store.py), so listings are
+indexed queries; clear-old is a single DELETE recorded in the queue journal,
+and compact folds that journal into data/news_queue.json.
+
 Usage:
   python scripts/queue_status.py
   python scripts/queue_status.py pending
   python scripts/queue_status.py posted
   python scripts/queue_status.py clear-old
+  python scripts/queue_status.py compact
 """
 
 from __future__ import annotations
 
 import json
 import sys
-from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.queue_store import QueueStore
+
 BASE_DIR = Path(__file__).parent.parent
 QUEUE_FILE = BASE_DIR / "data" / "news_queue.json"
+QUEUE_DB_FILE = BASE_DIR / "data" / "news_queue.db"
 RUN_LOG_FILE = BASE_DIR / "_data" / "run_log.json"
 
 
@@ -31,11 +40,6 @@ def load_json(path: Path, default: Any) -> Any:
         return default
 
 
-def save_json(path: Path, value: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(value, indent=2))
-
-
 def print_header(text: str) -> None:
     print(f"\n{'=' * 60}")
     print(f" {text}")
@@ -106,71 +110,42 @@ def show_recent_runs(run_log: List[Dict[str, Any]], limit: int = 5) -> None:
         print(f"  {ran_at} - Candidates: {candidates}, Posts: {posts}, Queued: {queued}")
 
 
-def parse_date_utc(value: str) -> Optional[datetime]:
-    if not value:
-        return None
-    for fmt in ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S"):
-        try:
-            dt = datetime.strptime(value[: len(fmt)], fmt)
-            return dt.replace(tzinfo=timezone.utc)
-        except Exception:
-            pass
-    return None
-
-
-def clear_old_pending(queue: Dict[str, Any], keep_days: int = 14) -> int:
-    pending = list(queue.get("pending", []) or [])
-    cutoff = datetime.now(timezone.utc).date() - timedelta(days=keep_days)
-    kept: List[Dict[str, Any]] = []
-    removed = 0
-    for item in pending:
-        fetched_at = parse_date_utc(str(item.get("fetched_at", "") or ""))
-        if fetched_at and fetched_at.date() < cutoff:
-            removed += 1
-            continue
-        kept.append(item)
-    queue["pending"] = kept
-    return removed
-
-
 def main(argv: Optional[Sequence[str]] = None) -> int:
     argv = list(argv) if argv is not None else sys.argv[1:]
     cmd = argv[0] if argv else "all"
 
-    queue_data = load_json(
-        QUEUE_FILE,
-        {"queue": [], "config": {}, "pending": [], "posted": [], "daily_usage": []},
-    )
+    store = QueueStore.open(QUEUE_FILE, QUEUE_DB_FILE)
     run_log = load_json(RUN_LOG_FILE, [])
 
     if cmd == "clear-old":
-        removed = clear_old_pending(queue_data, keep_days=14)
-        save_json(QUEUE_FILE, queue_data)
+        with store.transaction():
+            removed = store.prune_pending(keep_days=14)
         print(f"Removed {removed} old pending items.")
         return 0
 
-    config = queue_data.get("config", {}) or {}
-    pending = list(queue_data.get("pending", []) or [])
-    posted = list(queue_data.get("posted", []) or [])
-    usage = list(queue_data.get("daily_usage", []) or [])
+    if cmd == "compact":
+        ops = len(store.journal_ops())
+        store.compact()
+        print(f"Folded {ops} journal entries into {QUEUE_FILE.name}.")
+        return 0
 
     if cmd in ("all", ""):
-        show_config(config)
-        show_daily_usage(usage)
-        show_items(pending, title="PENDING (top 15)", limit=15)
-        show_items(posted, title="POSTED (top 15 by score)", limit=15)
+        show_config(store.config())
+        show_daily_usage(store.daily_usage())
+        show_items(store.pending(limit=15), title="PENDING (top 15)", limit=15)
+        show_items(store.posted(by_score=True, limit=15), title="POSTED (top 15 by score)", limit=15)
         show_recent_runs(run_log)
         return 0
 
     if cmd == "pending":
-        show_items(pending, title="PENDING (top 50)", limit=50)
+        show_items(store.pending(limit=50), title="PENDING (top 50)", limit=50)
         return 0
 
     if cmd == "posted":
-        show_items(posted, title="POSTED (top 50 by score)", limit=50)
+        show_items(store.posted(by_score=True, limit=50), title="POSTED (top 50 by score)", limit=50)
         return 0
 
-    print("Unknown command. Use: pending | posted | clear-old")
+    print("Unknown command. Use: pending | posted | clear-old | compact")
     return 2
 
 
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed store for the news queue.
+
+The committed source of truth is a snapshot, data/news_queue.json, plus an
+append-only journal of the mutations made since, data/news_queue.journal.jsonl:
+
+  {"op": "pending", "at": ..., "entry": {...}}    # add/replace a pending entry
+  {"op": "posted", "at": ..., "entry": {...}}     # add a posted entry (drops it from pending)
+  {"op": "prune", "at": ..., "before": "YYYY-MM-DD"}  # drop pending fetched before that day
+  {"op": "usage", "at": ..., "entry": {...}}      # daily_usage entry for one date
+  {"op": "config", "at": ..., "config": {...}}
+
+A run appends a few lines instead of rewriting the whole file, so write cost
+and git diffs scale with the change. compact() folds the journal into a new
+snapshot; generate_news.py does that once the journal is older than
+QUEUE_COMPACT_INTERVAL or longer than QUEUE_COMPACT_MAX_OPS lines.
+
+Snapshot and journal writes go through scripts/storage.py (atomic replace,
+lock on the journal) while the SQLite write lock is held, so jobs sharing a
+checkout serialize their queue updates.
+
+data/news_queue.db is a local, gitignored working copy with indexes. On open
+it is checked against the snapshot digest and the journal prefix it has
+applied: new journal lines are replayed, and anything else (fresh checkout,
+manual edit, git pull over a compaction) rebuilds it from snapshot + journal.
+
+  pending(canonical_url PK, seq, title, score, fetched_at, data)
+  posted(canonical_url PK, seq, title, score, posted_at, data)
+  daily_usage(date PK, seq, data)
+  meta(key PK, value)         # config, other top-level keys, json_digest
+
+`data` holds the full entry as JSON; the other columns are indexed copies.
+`seq` keeps the file's list order so exports round-trip unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from scripts.config import canonicalize_url
+from scripts.storage import atomic_write_text, file_lock
+
+REPO_ROOT = Path(__file__).parent.parent
+QUEUE_FILE = REPO_ROOT / "data" / "news_queue.json"
+QUEUE_DB_FILE = REPO_ROOT / "data" / "news_queue.db"
+QUEUE_JOURNAL_FILE = REPO_ROOT / "data" / "news_queue.journal.jsonl"
+
+QUEUE_COMPACT_INTERVAL = timedelta(hours=24)
+QUEUE_COMPACT_MAX_OPS = 2000
+
+DEFAULT_QUEUE: Dict[str, Any] = {
+    "queue": [],
+    "config": {"daily_post_limit": 5, "min_score_to_post": 50, "max_words_per_post": 200},
+    "pending": [],
+    "posted": [],
+    "daily_usage": [],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    canonical_url TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    score INTEGER NOT NULL DEFAULT 0,
+    fetched_at TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pending_score ON pending (score DESC, seq);
+CREATE INDEX IF NOT EXISTS pending_fetched_at ON pending (fetched_at);
+
+CREATE TABLE IF NOT EXISTS posted (
+    canonical_url TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    score INTEGER NOT NULL DEFAULT 0,
+    posted_at TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS posted_seq ON posted (seq);
+CREATE INDEX IF NOT EXISTS posted_score ON posted (score DESC, seq);
+CREATE INDEX IF NOT EXISTS posted_posted_at ON posted (posted_at);
+
+CREATE TABLE IF NOT EXISTS daily_usage (
+    date TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Top-level keys of news_queue.json, in file order.
+QUEUE_KEYS = ("queue", "config", "pending", "posted", "daily_usage")
+
+
+def render_queue_json(queue: Dict[str, Any]) -> str:
+    return json.dumps(queue, indent=2, sort_keys=False)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _score(entry: Dict[str, Any]) -> int:
+    try:
+        return int(entry.get("score", 0) or 0)
+    except Exception:
+        return 0
+
+
+def entry_key(entry: Dict[str, Any]) -> str:
+    """Canonical URL of an entry (stored on it as "canonical_url" if missing)."""
+    canonical = entry.get("canonical_url")
+    if not canonical:
+        canonical = canonicalize_url(entry.get("url") or entry.get("source_url") or "")
+        if canonical:
+            entry["canonical_url"] = canonical
+    return canonical or ""
+
+
+class QueueStore:
+    """Indexed SQLite working copy of the queue snapshot + journal."""
+
+    def __init__(self, conn: sqlite3.Connection, json_path: Path, journal_path: Path) -> None:
+        self.conn = conn
+        self.json_path = json_path
+        self.journal_path = journal_path
+        # Ops recorded by the open transaction; None while replaying/importing.
+        self._pending_ops: Optional[List[Dict[str, Any]]] = None
+        self._depth = 0
+
+    @classmethod
+    def open(
+        cls,
+        json_path: Optional[Path] = None,
+        db_path: Optional[Path] = None,
+        journal_path: Optional[Path] = None,
+    ) -> "QueueStore":
+        json_path = json_path or QUEUE_FILE
+        db_path = db_path or QUEUE_DB_FILE
+        journal_path = journal_path or json_path.with_name(json_path.stem + ".journal.jsonl")
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Jobs sharing a checkout queue up on the write lock instead of failing.
+        conn = sqlite3.connect(str(db_path), isolation_level=None, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        store = cls(conn, json_path, journal_path)
+        store.sync()
+        return store
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self, *, commit: bool = True, journal: bool = True) -> Iterator["QueueStore"]:
+        """
+        One write transaction; rolled back on error (or when commit=False).
+        Mutations made inside are appended to the journal just before COMMIT.
+        """
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        self._pending_ops = [] if journal else None
+        try:
+            yield self
+            if commit and self._pending_ops:
+                self._append_journal(self._pending_ops)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._depth = 0
+            self._pending_ops = None
+        self.conn.execute("COMMIT" if commit else "ROLLBACK")
+
+    def _record(self, op: str, **fields: Any) -> None:
+        if self._pending_ops is not None:
+            at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self._pending_ops.append({"op": op, "at": at, **fields})
+
+    # -- meta -----------------------------------------------------------------
+
+    def _meta(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    def config(self) -> Dict[str, Any]:
+        return dict(self._meta("config", {}) or {})
+
+    def set_config(self, config: Dict[str, Any]) -> None:
+        if config != self.config():
+            self._record("config", config=config)
+        self._set_meta("config", config)
+
+    # -- sync / export ----------------------------------------------------------
+
+    def _read_snapshot(self) -> str:
+        if self.json_path.exists():
+            return self.json_path.read_text()
+        return render_queue_json(DEFAULT_QUEUE)
+
+    def _read_journal(self) -> str:
+        return self.journal_path.read_text() if self.journal_path.exists() else ""
+
+    def sync(self) -> str:
+        """
+        Bring the DB up to date with snapshot + journal.
+        Returns "current", "replayed" (only new journal lines) or "rebuilt".
+        """
+        # Files are read under the write lock so another job can't append or
+        # compact between the check and the replay.
+        with self.transaction(journal=False):
+            snapshot = self._read_snapshot()
+            journal = self._read_journal()
+            applied = int(self._meta("journal_size", 0) or 0)
+            if (
+                self._meta("json_digest") == _digest(snapshot)
+                and len(journal) >= applied
+                and self._meta("journal_digest") == _digest(journal[:applied])
+            ):
+                if len(journal) == applied:
+                    return "current"
+                self._replay(journal[applied:])
+                self._mark_applied(journal)
+                return "replayed"
+            self._rebuild(snapshot, journal)
+        return "rebuilt"
+
+    def _rebuild(self, snapshot: str, journal: str) -> None:
+        queue = json.loads(snapshot) if snapshot.strip() else dict(DEFAULT_QUEUE)
+        self.conn.execute("DELETE FROM pending")
+        self.conn.execute("DELETE FROM posted")
+        self.conn.execute("DELETE FROM daily_usage")
+        self.conn.execute("DELETE FROM meta")
+        self.set_config(queue.get("config", {}) or {})
+        self._set_meta("extra", {k: v for k, v in queue.items() if k not in ("config", "pending", "posted", "daily_usage")})
+        self._set_meta("keys", list(queue.keys()))
+        self.upsert_pending(queue.get("pending", []) or [])
+        for entry in queue.get("posted", []) or []:
+            self.add_posted(entry)
+        for usage in queue.get("daily_usage", []) or []:
+            self.upsert_daily_usage(usage)
+        self._set_meta("json_digest", _digest(snapshot))
+        self._replay(journal)
+        self._mark_applied(journal)
+
+    def _replay(self, text: str) -> None:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from an interrupted append
+            kind = op.get("op")
+            if kind == "pending":
+                self.upsert_pending([op.get("entry") or {}])
+            elif kind == "posted":
+                self.add_posted(op.get("entry") or {})
+            elif kind == "prune":
+                self._prune_before(str(op.get("before", "")))
+            elif kind == "usage":
+                self.upsert_daily_usage(op.get("entry") or {})
+            elif kind == "config":
+                self.set_config(op.get("config") or {})
+
+    def _mark_applied(self, journal: str) -> None:
+        self._set_meta("journal_size", len(journal))
+        self._set_meta("journal_digest", _digest(journal))
+
+    def _append_journal(self, ops: List[Dict[str, Any]]) -> None:
+        journal = self._read_journal()
+        # Never glue onto a torn last line left by an interrupted append.
+        text = ("" if not journal or journal.endswith("\n") else "\n") + "".join(
+            json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n" for op in ops
+        )
+        with file_lock(self.journal_path), self.journal_path.open("a") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._mark_applied(journal + text)
+
+    def journal_ops(self) -> List[Dict[str, Any]]:
+        ops: List[Dict[str, Any]] = []
+        for line in self._read_journal().splitlines():
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                continue
+        return ops
+
+    def needs_compaction(
+        self,
+        *,
+        max_age: timedelta = QUEUE_COMPACT_INTERVAL,
+        max_ops: int = QUEUE_COMPACT_MAX_OPS,
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """True once the journal has max_ops lines or its oldest line is max_age old."""
+        ops = self.journal_ops()
+        if not ops:
+            return False
+        if len(ops) >= max_ops:
+            return True
+        try:
+            started = datetime.fromisoformat(str(ops[0].get("at")))
+        except ValueError:
+            return True
+        return (now or datetime.now(timezone.utc)) - started >= max_age
+
+    def to_queue(self) -> Dict[str, Any]:
+        """The queue in news_queue.json's shape and order."""
+        sections = {
+            "config": self.config(),
+            "pending": self.pending(),
+            "posted": self.posted(),
+            "daily_usage": self.daily_usage(),
+        }
+        extra = self._meta("extra", {}) or {}
+        keys = list(self._meta("keys", list(QUEUE_KEYS)) or QUEUE_KEYS)
+        for key in QUEUE_KEYS:
+            if key not in keys:
+                keys.append(key)
+        return {key: sections[key] if key in sections else extra.get(key, []) for key in keys}
+
+    def compact(self) -> Dict[str, Any]:
+        """Fold the journal into a fresh snapshot and truncate it."""
+        with self.transaction(journal=False), file_lock(self.journal_path):
+            queue = self.to_queue()
+            text = render_queue_json(queue)
+            atomic_write_text(self.json_path, text)
+            atomic_write_text(self.journal_path, "")
+            self._set_meta("json_digest", _digest(text))
+            self._mark_applied("")
+        return queue
+
+    # -- pending ----------------------------------------------------------------
+
+    def _next_seq(self, table: str) -> int:
+        row = self.conn.execute(f"SELECT COALESCE(MAX(seq), -1) + 1 FROM {table}").fetchone()
+        return int(row[0])
+
+    def upsert_pending(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace pending entries by canonical URL. Returns how many were new."""
+        seq = self._next_seq("pending")
+        added = 0
+        for entry in entries:
+            key = entry_key(entry) or f"#pending-{seq}"
+            cur = self.conn.execute(
+                "INSERT INTO pending (canonical_url, seq, title, score, fetched_at, data) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(canonical_url) DO UPDATE SET title = excluded.title, score = excluded.score, "
+                "fetched_at = excluded.fetched_at, data = excluded.data "
+                "RETURNING seq",
+                (key, seq, entry.get("title", "") or "", _score(entry), str(entry.get("fetched_at", "") or ""),
+                 json.dumps(entry, ensure_ascii=False)),
+            )
+            if cur.fetchone()[0] == seq:
+                added += 1
+                seq += 1
+            self._record("pending", entry=entry)
+        return added
+
+    def prune_pending(self, *, keep_days: int, today: Optional[datetime] = None) -> int:
+        """Delete pending entries fetched more than keep_days ago (indexed on fetched_at)."""
+        cutoff = ((today or datetime.now(timezone.utc)).date() - timedelta(days=keep_days)).isoformat()
+        removed = self._prune_before(cutoff)
+        if removed:
+            self._record("prune", before=cutoff)
+        return removed
+
+    def _prune_before(self, cutoff: str) -> int:
+        cur = self.conn.execute("DELETE FROM pending WHERE fetched_at != '' AND substr(fetched_at, 1, 10) < ?", (cutoff,))
+        return cur.rowcount
+
+    def pending(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Pending entries, highest score first (ties in insertion order)."""
+        sql = "SELECT data FROM pending ORDER BY score DESC, seq"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(row[0]) for row in self.conn.execute(sql)]
+
+    def pending_count(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0])
+
+    # -- posted -----------------------------------------------------------------
+
+    def add_posted(self, entry: Dict[str, Any]) -> None:
+        seq = self._next_seq("posted")
+        key = entry_key(entry) or f"#posted-{seq}"
+        self.conn.execute(
+            "INSERT OR REPLACE INTO posted (canonical_url, seq, title, score, posted_at, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, seq, entry.get("title", "") or "", _score(entry), str(entry.get("posted_at", "") or ""),
+             json.dumps(entry, ensure_ascii=False)),
+        )
+        self.conn.execute("DELETE FROM pending WHERE canonical_url = ?", (key,))
+        self._record("posted", entry=entry)
+
+    def posted(self, *, by_score: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Posted entries in posting order (or highest score first)."""
+        sql = "SELECT data FROM posted ORDER BY " + ("score DESC, seq" if by_score else "seq")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(row[0]) for row in self.conn.execute(sql)]
+
+    # -- lookups ----------------------------------------------------------------
+
+    def pending_urls(self) -> Set[str]:
+        rows = self.conn.execute("SELECT canonical_url FROM pending")
+        return {row[0] for row in rows if not row[0].startswith("#")}
+
+    def posted_urls(self) -> List[str]:
+        rows = self.conn.execute("SELECT canonical_url FROM posted ORDER BY seq")
+        return [row[0] for row in rows if not row[0].startswith("#")]
+
+    def posted_count(self) -> int:
+        return int(self.conn.execute("SELECT COUNT(*) FROM posted WHERE canonical_url NOT LIKE '#%'").fetchone()[0])
+
+    def titles(self) -> List[str]:
+        rows = self.conn.execute("SELECT title FROM pending UNION ALL SELECT title FROM posted")
+        return [row[0] for row in rows if row[0]]
+
+    def recent(self, table: str, since: str) -> List[Dict[str, Any]]:
+        """Pending entries fetched, or posted entries posted, on or after `since` (YYYY-MM-DD)."""
+        column = {"pending": "fetched_at", "posted": "posted_at"}[table]
+        rows = self.conn.execute(f"SELECT data FROM {table} WHERE {column} >= ? ORDER BY seq", (since,))
+        return [json.loads(row[0]) for row in rows]
+
+    # -- daily usage --------------------------------------------------------------
+
+    def daily_usage(self) -> List[Dict[str, Any]]:
+        return [json.loads(row[0]) for row in self.conn.execute("SELECT data FROM daily_usage ORDER BY seq")]
+
+    def usage_for(self, date: str) -> Dict[str, Any]:
+        row = self.conn.execute("SELECT data FROM daily_usage WHERE date = ?", (date,)).fetchone()
+        if row:
+            return json.loads(row[0])
+        return {"date": date, "posts": 0, "items_processed": 0, "estimated_tokens": 0}
+
+    def upsert_daily_usage(self, usage: Dict[str, Any]) -> None:
+        date = str(usage.get("date", "") or "")
+        row = self.conn.execute("SELECT data FROM daily_usage WHERE date = ?", (date,)).fetchone()
+        if row and json.loads(row[0]) == usage:
+            return
+        self._record("usage", entry=usage)
+        self.conn.execute(
+            "INSERT INTO daily_usage (date, seq, data) VALUES (?, (SELECT COALESCE(MAX(seq), -1) + 1 FROM daily_usage), ?) "
+            "ON CONFLICT(date) DO UPDATE SET data = excluded.data",
+            (date, json.dumps(usage, ensure_ascii=False)),
+        )
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Table-driven story scoring.
+
+The rules live in data/scoring_rules.json and are compiled once into weight
+tables: age bucket thresholds/points, per-company and per-topic points, and the
+substring groups for keyword bonuses/penalties. A batch of candidates is then
+scored in one pass: table lookups and substring checks per story for the base
+term, a bisect over the bucket thresholds for the age term, then the clamp.
+
+  score = clamp(age_points + base, min_score, max_score)
+
+where `base` (everything but age) is what scripts/classify_cache.py stores.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from scripts.config import COMPANY_KEYWORDS, get_company_tier
+
+REPO_ROOT = Path(__file__).parent.parent
+SCORING_RULES_FILE = REPO_ROOT / "data" / "scoring_rules.json"
+
+# Used when data/scoring_rules.json is missing or unreadable.
+DEFAULT_SCORING_RULES: Dict[str, Any] = {
+    "age": {
+        "buckets": [
+            {"max_days": 0, "points": 25},
+            {"max_days": 1, "points": 22},
+            {"max_days": 3, "points": 16},
+            {"max_days": 7, "points": 10},
+        ],
+        "older_points": -15,
+        "unknown_points": 0,
+    },
+    "companies": {"tier_points": {"1": 18, "2": 10}, "in_title_points": 6},
+    "topics": {"points": {"ai": 3}, "default_points": 8, "in_title_points": 3},
+    "keywords": [
+        {
+            "points": 6,
+            "any": [
+                "release", "launch", "announc", "introduc", "open-sourc", "weights", "funding",
+                "raises", "acquires", "partnership", "policy", "regulation", "ban",
+            ],
+        },
+        {"points": -4, "any": ["rumor", "leak", "reportedly", "unconfirmed"]},
+    ],
+    "min_score": 0,
+    "max_score": 100,
+}
+
+# One scored story: (title, snippet, companies, topics).
+Story = Tuple[str, str, Sequence[str], Sequence[str]]
+
+
+class ScoringRules:
+    """Scoring rules compiled into lookup tables."""
+
+    def __init__(self, rules: Dict[str, Any]) -> None:
+        self.rules = rules
+        self.version = hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+        age = rules.get("age") or {}
+        buckets = sorted(age.get("buckets") or [], key=lambda b: int(b["max_days"]))
+        self.age_thresholds: List[int] = [int(b["max_days"]) for b in buckets]
+        # Index i = first bucket with age <= max_days; the last slot is "older".
+        self.age_points: List[int] = [int(b["points"]) for b in buckets] + [int(age.get("older_points", 0))]
+        self.age_unknown_points = int(age.get("unknown_points", 0))
+
+        companies = rules.get("companies") or {}
+        self.tier_points: Dict[int, int] = {int(k): int(v) for k, v in (companies.get("tier_points") or {}).items()}
+        self.company_in_title = int(companies.get("in_title_points", 0))
+        self.company_points: Dict[str, int] = {c: self._tier_points(c) for c in COMPANY_KEYWORDS}
+
+        topics = rules.get("topics") or {}
+        self.topic_points: Dict[str, int] = {k: int(v) for k, v in (topics.get("points") or {}).items()}
+        self.topic_default = int(topics.get("default_points", 0))
+        self.topic_in_title = int(topics.get("in_title_points", 0))
+
+        # Each group adds its points once if any of its substrings occurs.
+        self.keyword_points: List[int] = []
+        self.keyword_words: List[Tuple[str, ...]] = []
+        for group in rules.get("keywords") or []:
+            words = tuple(str(w).lower() for w in group.get("any") or [] if w)
+            if words:
+                self.keyword_points.append(int(group.get("points", 0)))
+                self.keyword_words.append(words)
+
+        self.min_score = int(rules.get("min_score", 0))
+        self.max_score = int(rules.get("max_score", 100))
+
+    def _tier_points(self, company: str) -> int:
+        tier = get_company_tier(company)
+        return self.tier_points.get(tier, self.tier_points.get(2, 0))
+
+    def age_scores(self, published: Sequence[Optional[datetime]], now: Optional[datetime] = None) -> List[int]:
+        """Freshness points per story (whole days old, as timedelta.days)."""
+        now = now or datetime.now(timezone.utc)
+        known = [i for i, p in enumerate(published) if p]
+        out = [self.age_unknown_points] * len(published)
+        if not known:
+            return out
+        days = [(now - published[i]).days for i in known]
+        for i, d in zip(known, days):
+            out[i] = self.age_points[bisect_left(self.age_thresholds, d)]
+        return out
+
+    def base_scores(self, stories: Sequence[Story]) -> List[int]:
+        """Everything but the age term, unclamped, per story."""
+        company_points = self.company_points
+        topic_points = self.topic_points
+        topic_default = self.topic_default
+        company_in_title = self.company_in_title
+        topic_in_title = self.topic_in_title
+        keyword_groups = list(zip(self.keyword_points, self.keyword_words))
+
+        out: List[int] = []
+        for title, snippet, companies, topics in stories:
+            title_lower = (title or "").lower()
+            points = 0
+            for c in companies:
+                points += company_points[c] if c in company_points else self._tier_points(c)
+                if c in title_lower:
+                    points += company_in_title
+            for t in topics:
+                points += topic_points.get(t, topic_default)
+                if t in title_lower:
+                    points += topic_in_title
+            if keyword_groups:
+                combined_lower = f"{title} {snippet}".lower()
+                for group_points, words in keyword_groups:
+                    for word in words:
+                        if word in combined_lower:
+                            points += group_points
+                            break
+            out.append(points)
+        return out
+
+    def combine(self, ages: Sequence[int], bases: Sequence[int]) -> List[int]:
+        """Clamp age + base into [min_score, max_score]."""
+        return [max(self.min_score, min(self.max_score, a + b)) for a, b in zip(ages, bases)]
+
+    def score_batch(self, stories: Sequence[Story], published: Sequence[Optional[datetime]], now: Optional[datetime] = None) -> List[int]:
+        return self.combine(self.age_scores(published, now), self.base_scores(stories))
+
+
+def load_scoring_rules(path: Optional[Path] = None) -> ScoringRules:
+    """Compile data/scoring_rules.json, falling back to DEFAULT_SCORING_RULES."""
+    path = path or SCORING_RULES_FILE
+    rules = DEFAULT_SCORING_RULES
+    if path.exists():
+        try:
+            data = json.loads(path.read_text())
+            if isinstance(data, dict):
+                rules = data
+        except Exception:
+            pass
+    return ScoringRules(rules)
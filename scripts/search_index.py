@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Client-side search index for the Archives page.
+
+_data/search_index.json maps word tokens (from title, source and tags) and
+company/topic facets to item ids, so a search is a few postings lookups
+instead of a scan over every row:
+
+  {"digest": ..., "items": [[url, page, text_hash], ...],
+   "tokens": {"openai": [0, 4, ...], ...},
+   "companies": {"openai": [...]}, "topics": {"agents": [...]}}
+
+An item's id is its position in "items". page is the index of the
+assets/queue/ shard holding a pending item (-1 for posted items), so the page
+only fetches shards that contain matches. assets/search-index.json serves the
+file to the browser on the first search.
+
+The index is updated incrementally: token sets of items already indexed are
+recovered from the postings and only new or retitled items are tokenized.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from scripts.storage import atomic_write_text
+
+REPO_ROOT = Path(__file__).parent.parent
+SEARCH_INDEX_FILE = REPO_ROOT / "_data" / "search_index.json"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _text_hash(item: Dict[str, Any]) -> str:
+    text = "\0".join(
+        [str(item.get("title", "") or ""), str(item.get("source", "") or "")]
+        + [str(t) for t in item.get("companies") or []]
+        + ["#"]
+        + [str(t) for t in item.get("topics") or []]
+    )
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:8]
+
+
+def search_tokens(item: Dict[str, Any]) -> FrozenSet[str]:
+    tags = list(item.get("companies") or []) + list(item.get("topics") or [])
+    text = " ".join([str(item.get("title", "") or ""), str(item.get("source", "") or "")] + [str(t) for t in tags])
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+class _Doc:
+    __slots__ = ("page", "text_hash", "tokens", "companies", "topics")
+
+    def __init__(self, page: int, text_hash: str, tokens: FrozenSet[str], companies: FrozenSet[str], topics: FrozenSet[str]) -> None:
+        self.page = page
+        self.text_hash = text_hash
+        self.tokens = tokens
+        self.companies = companies
+        self.topics = topics
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self._docs: Dict[str, _Doc] = {}
+        self._digest = ""
+        self.tokenized = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "SearchIndex":
+        """Rebuild per-item docs by inverting the stored postings."""
+        path = path or SEARCH_INDEX_FILE
+        index = cls()
+        try:
+            data = json.loads(path.read_text())
+            items = data.get("items") or []
+            fields: Dict[str, List[set]] = {}
+            for name in ("tokens", "companies", "topics"):
+                per_item: List[set] = [set() for _ in items]
+                for key, ids in (data.get(name) or {}).items():
+                    for i in ids:
+                        per_item[i].add(key)
+                fields[name] = per_item
+            for i, (url, page, text_hash) in enumerate(items):
+                index._docs[url] = _Doc(
+                    int(page), str(text_hash),
+                    frozenset(fields["tokens"][i]), frozenset(fields["companies"][i]), frozenset(fields["topics"][i]),
+                )
+            index._digest = str(data.get("digest", ""))
+        except Exception:
+            return cls()
+        return index
+
+    def sync(self, items: Iterable[Tuple[Dict[str, Any], int]]) -> None:
+        """Index exactly `items` ((item, page) pairs); others are dropped."""
+        docs: Dict[str, _Doc] = {}
+        for item, page in items:
+            url = str(item.get("url", "") or "")
+            if not url or url in docs:
+                continue
+            text_hash = _text_hash(item)
+            doc = self._docs.get(url)
+            if doc is not None and doc.text_hash == text_hash:
+                doc.page = page
+            else:
+                self.tokenized += 1
+                doc = _Doc(
+                    page, text_hash, search_tokens(item),
+                    frozenset(str(c).lower() for c in item.get("companies") or []),
+                    frozenset(str(t).lower() for t in item.get("topics") or []),
+                )
+            docs[url] = doc
+        self._docs = docs
+
+    def to_json(self) -> Dict[str, Any]:
+        items: List[List[Any]] = []
+        postings: Dict[str, Dict[str, List[int]]] = {"tokens": {}, "companies": {}, "topics": {}}
+        for i, (url, doc) in enumerate(self._docs.items()):
+            items.append([url, doc.page, doc.text_hash])
+            for name, keys in (("tokens", doc.tokens), ("companies", doc.companies), ("topics", doc.topics)):
+                for key in keys:
+                    postings[name].setdefault(key, []).append(i)
+        body = {"items": items, **{name: dict(sorted(p.items())) for name, p in postings.items()}}
+        digest = hashlib.sha1(json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")).hexdigest()
+        return {"digest": digest, **body}
+
+    def save(self, path: Optional[Path] = None) -> bool:
+        """Write the index; returns False when it is unchanged."""
+        path = path or SEARCH_INDEX_FILE
+        payload = self.to_json()
+        if payload["digest"] == self._digest and path.exists():
+            return False
+        atomic_write_text(path, json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self._digest = payload["digest"]
+        return True
+
+
+def update_search_index(
+    posted: Sequence[Dict[str, Any]],
+    pending_pages: Sequence[Sequence[Dict[str, Any]]],
+    path: Optional[Path] = None,
+) -> bool:
+    """Sync the stored index with posted items and the public queue pages."""
+    index = SearchIndex.load(path)
+    items: List[Tuple[Dict[str, Any], int]] = [(item, -1) for item in posted]
+    for page, page_items in enumerate(pending_pages):
+        items.extend((item, page) for item in page_items)
+    index.sync(items)
+    return index.save(path)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Running totals for the Status page, kept in _data/stats.json.
+
+Each run adds its own deltas (stories fetched, candidates, posted and queued
+entries) to cumulative counters per company, topic, source and day, so the
+cost per run is proportional to what the run produced rather than to the
+size of _posts/ or the queue. The queue store is read once, to seed the
+counters when the file doesn't exist yet.
+
+  {"updated_at_utc": ..., "since": "YYYY-MM-DD",
+   "totals": {"runs", "raw", "candidates", "posted", "queued"},
+   "companies": {"openai": {"posted": n, "queued": n}, ...}, "topics": ..., "sources": ...,
+   "days": {"YYYY-MM-DD": {"runs", "raw", "candidates", "posted", "queued"}},
+   "top": {"companies": [{"name", "posted", "queued"}, ...], "topics": ..., "sources": ...}}
+
+"days" keeps the last STATS_DAYS days; "top" is derived on save for Liquid,
+which can't sort a map by value. save() holds the file lock and, if another
+process saved since load(), replays this run's deltas onto that newer file.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from scripts.storage import atomic_write_text, file_lock, read_json
+
+REPO_ROOT = Path(__file__).parent.parent
+STATS_FILE = REPO_ROOT / "_data" / "stats.json"
+
+STATS_DAYS = 90
+STATS_TOP = 10
+
+_COUNTERS = ("runs", "raw", "candidates", "posted", "queued")
+_FACETS = ("companies", "topics", "sources")
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        "updated_at_utc": "",
+        "since": "",
+        "totals": {key: 0 for key in _COUNTERS},
+        "companies": {},
+        "topics": {},
+        "sources": {},
+        "days": {},
+    }
+
+
+class RunStats:
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self.data = _empty_stats()
+        for key, value in (data or {}).items():
+            if key in self.data and key != "top":
+                self.data[key] = value
+        self._loaded_at = self.data["updated_at_utc"]
+        self._runs: List[Dict[str, Any]] = []
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> Optional["RunStats"]:
+        """Stored counters, or None when the file is missing or unreadable."""
+        data = read_json(path or STATS_FILE, None)
+        return cls(data) if isinstance(data, dict) else None
+
+    @classmethod
+    def seed(cls, posted: Iterable[Dict[str, Any]], pending: Iterable[Dict[str, Any]]) -> "RunStats":
+        """Counters for an existing queue, used once when no stats file exists."""
+        stats = cls()
+        for entry in posted:
+            stats._count(entry, "posted", str(entry.get("posted_at", "") or "")[:10])
+        for entry in pending:
+            stats._count(entry, "queued", str(entry.get("fetched_at", "") or "")[:10])
+        return stats
+
+    def _day(self, day: str) -> Dict[str, int]:
+        days = self.data["days"]
+        if day not in days:
+            days[day] = {key: 0 for key in _COUNTERS}
+        if not self.data["since"] or day < self.data["since"]:
+            self.data["since"] = day
+        return days[day]
+
+    def _count(self, entry: Dict[str, Any], kind: str, day: str) -> None:
+        self.data["totals"][kind] += 1
+        if day:
+            self._day(day)[kind] += 1
+        keys = {
+            "companies": entry.get("companies") or [],
+            "topics": entry.get("topics") or [],
+            "sources": [entry.get("source") or urlsplit(str(entry.get("url", "") or "")).hostname or "unknown"],
+        }
+        for facet, names in keys.items():
+            for name in names:
+                bucket = self.data[facet].setdefault(str(name), {"posted": 0, "queued": 0})
+                bucket[kind] += 1
+
+    def record_run(
+        self,
+        *,
+        day: str,
+        raw: int = 0,
+        candidates: int = 0,
+        posted: Iterable[Dict[str, Any]] = (),
+        queued: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """Add one run's deltas."""
+        posted, queued = list(posted), list(queued)
+        self._runs.append({"day": day, "raw": raw, "candidates": candidates, "posted": posted, "queued": queued})
+        self._apply_run(day, raw, candidates, posted, queued)
+
+    def _apply_run(self, day: str, raw: int, candidates: int, posted: List[Dict[str, Any]], queued: List[Dict[str, Any]]) -> None:
+        counters = self._day(day)
+        for key, value in (("runs", 1), ("raw", raw), ("candidates", candidates)):
+            self.data["totals"][key] += value
+            counters[key] += value
+        for entry in posted:
+            self._count(entry, "posted", day)
+        for entry in queued:
+            self._count(entry, "queued", day)
+
+    def _top(self, facet: str) -> List[Dict[str, Any]]:
+        rows = [{"name": name, **counts} for name, counts in self.data[facet].items()]
+        rows.sort(key=lambda r: (-r["posted"], -r["queued"], r["name"]))
+        return rows[:STATS_TOP]
+
+    def save(self, path: Optional[Path] = None, *, today: Optional[date] = None) -> None:
+        path = path or STATS_FILE
+        with file_lock(path):
+            current = read_json(path, None)
+            if isinstance(current, dict) and current.get("updated_at_utc", "") != self._loaded_at:
+                # Someone else saved since we loaded: keep their counts, add ours.
+                self.data = RunStats(current).data
+                for run in self._runs:
+                    self._apply_run(**run)
+            self._write(path, today)
+        self._loaded_at = self.data["updated_at_utc"]
+        self._runs = []
+
+    def _write(self, path: Path, today: Optional[date]) -> None:
+        cutoff = ((today or datetime.now(timezone.utc).date()) - timedelta(days=STATS_DAYS)).isoformat()
+        self.data["days"] = {day: counts for day, counts in sorted(self.data["days"].items()) if day >= cutoff}
+        self.data["updated_at_utc"] = datetime.now(timezone.utc).isoformat()
+        payload = {**self.data, "top": {facet: self._top(facet) for facet in _FACETS}}
+        atomic_write_text(path, json.dumps(payload, indent=2, sort_keys=False, ensure_ascii=False))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Shared file writers for the data files several processes touch.
+
+The locks only coordinate processes sharing one checkout on one machine, e.g.
+a local generate_news.py run alongside queue_status.py. GitHub Actions jobs
+each get their own runner and checkout, so these locks never meet there; the
+workflows instead serialize fetch jobs and monitor retries with a shared
+`news-data` concurrency group and rebase-and-retry their push. Writers here:
+
+  - never leave a torn file: content goes to a temp file in the same
+    directory, is fsynced and then os.replace()d over the target;
+  - serialize read-modify-write cycles with an advisory lock on a sibling
+    "<name>.lock" file (fcntl.flock; a no-op where fcntl doesn't exist);
+  - merge instead of overwrite: update_json() re-reads the file under the
+    lock and applies the caller's change to whatever is there now, so a
+    concurrent writer's update is kept rather than lost.
+
+The run log is written through append_run_log(), which also fixes its
+retention at RUN_LOG_MAX_ENTRIES for every writer.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+REPO_ROOT = Path(__file__).parent.parent
+RUN_LOG_FILE = REPO_ROOT / "_data" / "run_log.json"
+
+# monitor.yml looks for today's run in the log; with smart fetch every 30
+# minutes this keeps about four days.
+RUN_LOG_MAX_ENTRIES = 200
+
+T = TypeVar("T")
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace `path` with `data` in one step (temp file + os.replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive advisory lock for `path`, held on `<path>.lock`."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path: Path, default: T) -> T:
+    try:
+        return json.loads(path.read_text())
+    except Exception:
+        return default
+
+
+def update_json(path: Path, update: Callable[[Any], T], *, default: Any = None, indent: Optional[int] = 2) -> T:
+    """
+    Locked read-modify-write: `update` receives the file's current content (or
+    `default`) and returns the new content, which is written atomically.
+    """
+    with file_lock(path):
+        current = read_json(path, default)
+        new = update(current)
+        separators = None if indent is not None else (",", ":")
+        atomic_write_text(path, json.dumps(new, indent=indent, separators=separators, ensure_ascii=False))
+    return new
+
+
+def append_run_log(entry: Dict[str, Any], path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Append one entry to the run log, keeping the last RUN_LOG_MAX_ENTRIES."""
+
+    def _append(log: Any) -> List[Dict[str, Any]]:
+        entries = log if isinstance(log, list) else []
+        return (entries + [entry])[-RUN_LOG_MAX_ENTRIES:]
+
+    return update_json(path or RUN_LOG_FILE, _append, default=[])
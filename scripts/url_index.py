@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Persistent membership index for posted URLs.
+
+Posted history only ever grows, so rebuilding a set of every posted URL on
+each run makes startup cost scale with years of history. UrlIndex keeps
+64-bit hashes of canonical URLs in data/url_index.bin instead:
+
+  header   magic b"URLX", version, count, bloom_bits, bloom_hashes (struct)
+  hashes   `count` sorted uint64 (little endian)
+  bloom    `bloom_bits / 8` bytes
+
+Loading is two buffer copies. A lookup checks the Bloom filter first (most
+fresh URLs stop there) and confirms with a binary search over the sorted
+hashes, so answers are exact up to a 64-bit hash collision. URLs added
+during a run sit in a small set until save() merges them in.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from scripts.storage import atomic_write_bytes
+
+REPO_ROOT = Path(__file__).parent.parent
+URL_INDEX_FILE = REPO_ROOT / "data" / "url_index.bin"
+
+_MAGIC = b"URLX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHIIH")
+
+# ~10 bits per URL and 7 probes keep false positives near 1%.
+BLOOM_BITS_PER_URL = 10
+BLOOM_HASHES = 7
+BLOOM_MIN_BITS = 1 << 16
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _bloom_size(count: int) -> int:
+    bits = BLOOM_MIN_BITS
+    while bits < count * BLOOM_BITS_PER_URL:
+        bits <<= 1
+    return bits
+
+
+def _probes(value: int, bits: int, hashes: int) -> Iterable[int]:
+    # Double hashing from the two 32-bit halves; bits is a power of two.
+    h1 = value & 0xFFFFFFFF
+    h2 = (value >> 32) | 1
+    mask = bits - 1
+    return ((h1 + i * h2) & mask for i in range(hashes))
+
+
+class UrlIndex:
+    def __init__(self, hashes: Optional[array] = None, bloom: Optional[bytearray] = None, bloom_hashes: int = BLOOM_HASHES) -> None:
+        self._sorted = hashes if hashes is not None else array("Q")
+        self._added: Set[int] = set()
+        self._bloom_hashes = bloom_hashes
+        if bloom is None:
+            bloom = bytearray(_bloom_size(len(self._sorted)) // 8)
+            for value in self._sorted:
+                self._set_bits(bloom, value)
+        self._bloom = bloom
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._added)
+
+    def __contains__(self, url: str) -> bool:
+        return bool(url) and self.contains_hash(url_hash(url))
+
+    def contains_hash(self, value: int) -> bool:
+        bloom = self._bloom
+        for bit in _probes(value, len(bloom) * 8, self._bloom_hashes):
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return False
+        if value in self._added:
+            return True
+        i = bisect_left(self._sorted, value)
+        return i < len(self._sorted) and self._sorted[i] == value
+
+    def _set_bits(self, bloom: bytearray, value: int) -> None:
+        for bit in _probes(value, len(bloom) * 8, self._bloom_hashes):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    def add(self, url: str) -> bool:
+        """Add a canonical URL; returns False if it was already indexed."""
+        if not url:
+            return False
+        value = url_hash(url)
+        if self.contains_hash(value):
+            return False
+        self._added.add(value)
+        self._set_bits(self._bloom, value)
+        return True
+
+    def _merge(self) -> None:
+        if not self._added:
+            return
+        self._sorted = array("Q", sorted(set(self._sorted).union(self._added)))
+        self._added = set()
+        if len(self._bloom) * 8 < _bloom_size(len(self._sorted)):
+            # Grown past its sizing: rebuild at the new size.
+            self._bloom = bytearray(_bloom_size(len(self._sorted)) // 8)
+            for value in self._sorted:
+                self._set_bits(self._bloom, value)
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[str]) -> "UrlIndex":
+        return cls(array("Q", sorted({url_hash(u) for u in urls if u})))
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "UrlIndex":
+        """Read the index from `path`; a missing or unreadable file gives an empty index."""
+        path = path or URL_INDEX_FILE
+        try:
+            data = path.read_bytes()
+            magic, version, count, bits, hashes = _HEADER.unpack_from(data)
+            if magic != _MAGIC or version != _VERSION or bits % 8 or bits < 8:
+                return cls()
+            start = _HEADER.size
+            end = start + count * 8
+            values = array("Q")
+            values.frombytes(data[start:end])
+            bloom = bytearray(data[end:end + bits // 8])
+            if len(values) != count or len(bloom) * 8 != bits:
+                return cls()
+        except Exception:
+            return cls()
+        if sys.byteorder != "little":
+            values.byteswap()
+        return cls(values, bloom, hashes)
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = path or URL_INDEX_FILE
+        self._merge()
+        values = array("Q", self._sorted)
+        if sys.byteorder != "little":
+            values.byteswap()
+        header = _HEADER.pack(_MAGIC, _VERSION, len(values), len(self._bloom) * 8, self._bloom_hashes)
+        atomic_write_bytes(path, header + values.tobytes() + bytes(self._bloom))